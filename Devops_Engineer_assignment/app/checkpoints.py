@@ -0,0 +1,139 @@
+"""Watermarks and job checkpoints for incremental, resumable collection
+
+Watermark:  position a source was fully collected up to (max updated_at, API cursor, file offset), keyed by source.
+            Delta jobs start from it; it only moves when a job completes, so a failed delta run never skips data.
+Checkpoint: position and counters of a running job, saved every few pages. A failed or interrupted job resumes
+            from its checkpoint instead of from the start. Stored checkpoints are deleted when the job completes
+            or fails; the ones of statuses nobody resumes or older than CHECKPOINT_MAX_AGE_SECONDS are dropped
+            by the resume scan.
+
+With REDIS_URL set both live in Redis, so a job interrupted by a crash or pod eviction is picked up by the next
+replica that scans for them (on startup and every RESUME_SCAN_INTERVAL_SECONDS). A job is owned through a lease
+renewed with every checkpoint; a job whose lease expired is abandoned and may be claimed again. Without Redis everything is kept in memory and only survives within the process.
+"""
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Dict, List
+
+from job_store import JobRecord, ms_from_iso
+from scheduler import REDIS_URL, RELEASE_LEASE_SCRIPT, RENEW_LEASE_SCRIPT, redis_asyncio
+
+logger = logging.getLogger(__name__)
+
+WATERMARKS_KEY = "dcs:watermarks"
+CHECKPOINTS_KEY = "dcs:checkpoints"
+JOB_OWNER_KEY = "dcs:job:{job_id}:owner"
+# Checkpoint after this many pages or seconds, whichever comes first; the job lease must outlive the gap
+CHECKPOINT_EVERY_PAGES = int(os.getenv("CHECKPOINT_EVERY_PAGES", "5"))
+CHECKPOINT_INTERVAL_SECONDS = float(os.getenv("CHECKPOINT_INTERVAL_SECONDS", "5"))
+JOB_LEASE_TTL_SECONDS = float(os.getenv("JOB_LEASE_TTL_SECONDS", "30"))
+# Statuses a checkpointed job is left in when its process went away; these are resumed once their lease expired
+RESUMABLE_STATUSES = ("processing", "interrupted")
+# Stored checkpoints are scanned on startup and then this often, so a job whose lease was still live when a
+# replacement pod started is picked up once the lease of the crashed pod runs out
+RESUME_SCAN_INTERVAL_SECONDS = float(os.getenv("RESUME_SCAN_INTERVAL_SECONDS", str(JOB_LEASE_TTL_SECONDS)))
+# Checkpoints not saved for this long belong to jobs nobody will resume, they are dropped by the scan
+CHECKPOINT_MAX_AGE_SECONDS = float(os.getenv("CHECKPOINT_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+
+
+def is_abandoned(checkpoint: Dict[str, Any]) -> bool:
+    return time.time() * 1000 - ms_from_iso(checkpoint["updated_at"]) > CHECKPOINT_MAX_AGE_SECONDS * 1000
+
+
+class MemoryCheckpointStore:
+    def __init__(self):
+        self._watermarks: Dict[str, Any] = {}
+        self._checkpoints: Dict[str, Dict[str, Any]] = {}
+
+    async def get_watermark(self, source_key: str):
+        return self._watermarks.get(source_key)
+
+    async def set_watermark(self, source_key: str, position):
+        self._watermarks[source_key] = position
+
+    async def save_checkpoint(self, job: Dict[str, Any]):
+        self._checkpoints[job["job_id"]] = dict(job)
+
+    async def delete_checkpoint(self, job_id: str):
+        self._checkpoints.pop(job_id, None)
+
+    async def load_checkpoints(self) -> List[Dict[str, Any]]:
+        return list(self._checkpoints.values())
+
+    async def claim_job(self, job_id: str) -> bool:
+        return True
+
+    async def release_job(self, job_id: str):
+        pass
+
+    async def close(self):
+        pass
+
+
+class RedisCheckpointStore:
+    """Watermarks and checkpoints in two Redis hashes, job ownership in per-job lease keys"""
+
+    def __init__(self, redis_url: str):
+        self.owner = f"{os.getenv('HOSTNAME', 'local')}:{uuid.uuid4().hex[:8]}"
+        self._client = redis_asyncio.from_url(redis_url, decode_responses=True)
+        self._renew = self._client.register_script(RENEW_LEASE_SCRIPT)
+        self._release = self._client.register_script(RELEASE_LEASE_SCRIPT)
+
+    async def get_watermark(self, source_key: str):
+        value = await self._client.hget(WATERMARKS_KEY, source_key)
+        return json.loads(value) if value is not None else None
+
+    async def set_watermark(self, source_key: str, position):
+        await self._client.hset(WATERMARKS_KEY, source_key, json.dumps(position))
+
+    async def save_checkpoint(self, job: Dict[str, Any]):
+        # Saving doubles as the heartbeat of the job lease
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.hset(CHECKPOINTS_KEY, job["job_id"], json.dumps(job, default=str))
+            pipe.pexpire(JOB_OWNER_KEY.format(job_id=job["job_id"]), int(JOB_LEASE_TTL_SECONDS * 1000))
+            await pipe.execute()
+
+    async def delete_checkpoint(self, job_id: str):
+        await self._client.hdel(CHECKPOINTS_KEY, job_id)
+
+    async def load_checkpoints(self) -> List[Dict[str, Any]]:
+        return [json.loads(value) for value in (await self._client.hgetall(CHECKPOINTS_KEY)).values()]
+
+    async def claim_job(self, job_id: str) -> bool:
+        ttl_ms = int(JOB_LEASE_TTL_SECONDS * 1000)
+        return bool(await self._renew(keys=[JOB_OWNER_KEY.format(job_id=job_id)], args=[self.owner, ttl_ms]))
+
+    async def release_job(self, job_id: str):
+        await self._release(keys=[JOB_OWNER_KEY.format(job_id=job_id)], args=[self.owner])
+
+    async def close(self):
+        await self._client.aclose()
+
+
+def create_checkpoint_store():
+    if REDIS_URL and redis_asyncio is not None:
+        return RedisCheckpointStore(REDIS_URL)
+    return MemoryCheckpointStore()
+
+
+class Checkpointer:
+    """Decides when a running job saves its checkpoint"""
+
+    def __init__(self, store, job: JobRecord):
+        self._store = store
+        self._job = job
+        self._pages = 0
+        self._saved_at = time.monotonic()
+
+    async def page_done(self):
+        self._pages += 1
+        if self._pages >= CHECKPOINT_EVERY_PAGES or time.monotonic() - self._saved_at >= CHECKPOINT_INTERVAL_SECONDS:
+            await self.save()
+
+    async def save(self):
+        await self._store.save_checkpoint(self._job.to_dict())
+        self._pages = 0
+        self._saved_at = time.monotonic()
@@ -0,0 +1,109 @@
+"""Source collectors. Each reads its source page by page from a position and reports the position after every page
+
+  database  position = max updated_at collected (ISO timestamp), pages are rows ordered by updated_at
+  api       position = cursor of the next page
+  file      position = byte offset, pages are chunks
+
+A run starts from None (full), a watermark (delta) or a checkpoint (resume). The sources are simulated: a full run
+takes as long as the previous fixed processing times, and delta runs only read what was added since the watermark.
+"""
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict
+
+# Simulated duration of a full run per source type, in seconds
+PROCESSING_TIMES = {"api": 5, "database": 10, "file": 15}
+# Config keys that only change how a run behaves (or the size of the simulated source), not which source it reads
+RUN_OPTION_KEYS = ("mode", "page_size", "records", "rows", "items", "size_bytes")
+SIMULATED_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class Page:
+    records: int
+    position: Any
+    progress: int
+
+
+def source_key(source_type: str, config: Dict[str, Any]) -> str:
+    """Stable identity of a source, "source_id" in the config or a hash of the source config"""
+    if config.get("source_id"):
+        return f"{source_type}:{config['source_id']}"
+    identity = {key: value for key, value in config.items() if key not in RUN_OPTION_KEYS}
+    digest = hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+    return f"{source_type}:{digest}"
+
+
+class Collector:
+    # Config key giving the simulated source size, in units of a page position
+    size_key = "records"
+    default_size = 100
+    page_size = 10
+
+    def __init__(self, source_type: str, config: Dict[str, Any]):
+        self.source_type = source_type
+        self.config = config
+        self.page_size = int(config.get("page_size", self.page_size))
+        self.total = int(config.get(self.size_key, self.default_size))
+        # Pages of a full run share the simulated processing time
+        self._page_delay = PROCESSING_TIMES.get(source_type, 5) / max(-(-self.total // self.page_size), 1)
+
+    def start_index(self, position) -> int:
+        return 0 if position is None else int(position)
+
+    def position_at(self, index: int):
+        return index
+
+    def record_count(self, start: int, end: int) -> int:
+        return end - start
+
+    async def pages(self, position) -> AsyncIterator[Page]:
+        index = min(self.start_index(position), self.total)
+        start = index
+        while index < self.total:
+            end = min(index + self.page_size, self.total)
+            await asyncio.sleep(self._page_delay)
+            progress = 100 * (end - start) // max(self.total - start, 1)
+            yield Page(records=self.record_count(index, end), position=self.position_at(end), progress=progress)
+            index = end
+
+
+class DatabaseCollector(Collector):
+    """Rows ordered by updated_at; row i of the simulated table was last updated i seconds after SIMULATED_EPOCH"""
+    size_key = "rows"
+
+    def start_index(self, position) -> int:
+        if position is None:
+            return 0
+        return int((datetime.fromisoformat(position) - SIMULATED_EPOCH).total_seconds())
+
+    def position_at(self, index: int):
+        return (SIMULATED_EPOCH + timedelta(seconds=index)).isoformat()
+
+
+class ApiCollector(Collector):
+    """Cursor paginated API, the cursor is the index of the next item"""
+    size_key = "items"
+
+    def position_at(self, index: int):
+        return str(index)
+
+
+class FileCollector(Collector):
+    """Append only file read in chunks; records are lines of about 1 KiB"""
+    size_key = "size_bytes"
+    default_size = 100 * 1024
+    page_size = 10 * 1024
+
+    def record_count(self, start: int, end: int) -> int:
+        return (end - start) // 1024
+
+
+COLLECTORS = {"database": DatabaseCollector, "api": ApiCollector, "file": FileCollector}
+
+
+def get_collector(source_type: str, config: Dict[str, Any]) -> Collector:
+    return COLLECTORS.get(source_type, Collector)(source_type, config)
@@ -0,0 +1,104 @@
+"""Conditional GET and negotiated compression for the job endpoints
+
+ETag:         responses carry the weak ETag of the job version they were rendered from. A poll with a matching
+              If-None-Match gets a bodyless 304 before any response model or JSON is built.
+Compression:  JSON bodies of at least COMPRESSION_MIN_BYTES are brotli or gzip encoded, whichever Accept-Encoding
+              prefers (brotli on ties). brotli is optional, without it only gzip is offered. Small bodies are sent
+              as is, compressing them costs more CPU than the bytes it saves.
+"""
+import gzip
+import json
+import os
+from typing import Any, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, stdlib json is the fallback
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+# Quality 11 is meant for static assets; 4 compresses JSON better than gzip at about the same CPU cost
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+# Server preference order for Accept-Encoding ties
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+VARY_HEADERS = {"Vary": "Accept-Encoding"}
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header with etag, as required for GET"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == opaque:
+            return True
+    return False
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """304 for a request that already holds etag, None when the body has to be sent"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, **VARY_HEADERS})
+    return None
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Supported content coding with the highest q-value in Accept-Encoding, None for identity"""
+    if not accept_encoding:
+        return None
+    qualities = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for coding in ENCODINGS:
+        quality = qualities.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def json_bytes(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=str)
+    return json.dumps(content, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def json_response(request: Request, content: Any, etag: Optional[str] = None, status_code: int = 200) -> Response:
+    """JSON response, compressed when large enough and accepted by the client"""
+    body = json_bytes(content)
+    headers = dict(VARY_HEADERS)
+    if etag:
+        headers["ETag"] = etag
+    if len(body) >= COMPRESSION_MIN_BYTES:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+        if encoding:
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+    return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
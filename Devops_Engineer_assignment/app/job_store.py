@@ -0,0 +1,189 @@
+"""Compact in-memory job records
+
+A job used to be a dict with string keys, a 36 character UUID string and ISO-8601 timestamp strings rebuilt on every
+status change. JobRecord keeps the same data in __slots__ (no per-instance __dict__), the UUID as a 128-bit int,
+timestamps as integer epoch milliseconds and the status as a JobState enum member, which is one shared object
+per state. Strings and ISO timestamps are only produced at the boundary: to_api_dict for the API, to_dict for the
+checkpoint store.
+Every change takes a new version from one process wide sequence; the status endpoints expose it as an ETag.
+See benchmarks/bench_job_store.py for the memory and throughput comparison with the dict layout.
+"""
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any, Dict, Iterator, Optional
+
+
+class JobState(str, Enum):
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    INTERRUPTED = "interrupted"
+
+
+FINISHED_STATES = frozenset({JobState.COMPLETED, JobState.FAILED})
+
+# Versions are only comparable within one process, ETags carry this id so they never match after a restart
+STORE_INSTANCE_ID = uuid.uuid4().hex[:8]
+# One sequence for all records: a new or changed record always takes the next version, so the last version
+# handed out changes with every change to any store of the process
+_latest_version = 0
+
+
+def _next_version() -> int:
+    global _latest_version
+    _latest_version += 1
+    return _latest_version
+
+
+def now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def iso_from_ms(timestamp_ms: int) -> str:
+    return datetime.fromtimestamp(timestamp_ms / 1000, timezone.utc).isoformat()
+
+
+def ms_from_iso(value: str) -> int:
+    return int(datetime.fromisoformat(value).timestamp() * 1000)
+
+
+def parse_job_id(job_id: str) -> Optional[int]:
+    """API job id (canonical UUID string) to the stored int, None for ids that cannot exist"""
+    # Four times faster than uuid.UUID(job_id).int, lookups by id are the hot path of the status endpoints
+    if len(job_id) != 36 or job_id[8] != "-" or job_id[13] != "-" or job_id[18] != "-" or job_id[23] != "-":
+        return None
+    try:
+        return int(job_id.replace("-", ""), 16)
+    except ValueError:
+        return None
+
+
+class JobRecord:
+    __slots__ = ("id", "status", "source_type", "mode", "config", "request_id", "schedule_id", "created_at",
+                 "updated_at", "progress", "result", "error", "checkpoint", "version")
+
+    def __init__(self, id: int, source_type: str, config: Dict[str, Any], mode: str = "full",
+                 request_id: Optional[str] = None, schedule_id: Optional[str] = None,
+                 status: JobState = JobState.QUEUED, created_at: Optional[int] = None):
+        self.id = id
+        self.status = status
+        # A handful of distinct values, interned so every record shares one string object
+        self.source_type = sys.intern(source_type)
+        self.mode = sys.intern(mode)
+        self.config = config
+        self.request_id = request_id
+        self.schedule_id = schedule_id
+        self.created_at = created_at if created_at is not None else now_ms()
+        self.updated_at = self.created_at
+        self.progress: Optional[int] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.checkpoint: Optional[Dict[str, Any]] = None
+        self.version = _next_version()
+
+    @property
+    def job_id(self) -> str:
+        return str(uuid.UUID(int=self.id))
+
+    @property
+    def etag(self) -> str:
+        # Weak: the same version is served gzip, brotli or identity encoded
+        return f'W/"{STORE_INSTANCE_ID}-{self.version}"'
+
+    def update(self, **changes):
+        """Change fields without a status change (progress, checkpoint)"""
+        for name, value in changes.items():
+            setattr(self, name, value)
+        self.version = _next_version()
+
+    def set_status(self, status: JobState, **changes):
+        """Move to status, updating the given fields and updated_at"""
+        self.status = status
+        self.updated_at = now_ms()
+        self.update(**changes)
+
+    def to_api_dict(self) -> Dict[str, Any]:
+        """Job as listed by the API: no resume state, progress/result/error only once they are set"""
+        job = {
+            "job_id": self.job_id,
+            "status": self.status.value,
+            "source_type": self.source_type,
+            "config": self.config,
+            "mode": self.mode,
+            "request_id": self.request_id,
+            "schedule_id": self.schedule_id,
+            "created_at": iso_from_ms(self.created_at),
+            "updated_at": iso_from_ms(self.updated_at),
+        }
+        for name in ("progress", "result", "error"):
+            value = getattr(self, name)
+            if value is not None:
+                job[name] = value
+        return job
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Checkpoint store representation, the layout of the former dict records"""
+        return {
+            "job_id": self.job_id,
+            "status": self.status.value,
+            "source_type": self.source_type,
+            "config": self.config,
+            "mode": self.mode,
+            "request_id": self.request_id,
+            "schedule_id": self.schedule_id,
+            "progress": self.progress,
+            "result": self.result,
+            "error": self.error,
+            "checkpoint": self.checkpoint,
+            "created_at": iso_from_ms(self.created_at),
+            "updated_at": iso_from_ms(self.updated_at),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "JobRecord":
+        record = cls(parse_job_id(data["job_id"]), data["source_type"], data.get("config") or {},
+                     data.get("mode", "full"), data.get("request_id"), data.get("schedule_id"),
+                     JobState(data["status"]), ms_from_iso(data["created_at"]))
+        record.updated_at = ms_from_iso(data.get("updated_at") or data["created_at"])
+        record.progress = data.get("progress")
+        record.result = data.get("result")
+        record.error = data.get("error")
+        record.checkpoint = data.get("checkpoint")
+        return record
+
+
+class JobStore:
+    """Job records keyed by the int form of their UUID"""
+
+    def __init__(self):
+        self._records: Dict[int, JobRecord] = {}
+
+    def create(self, source_type: str, config: Dict[str, Any], **fields) -> JobRecord:
+        record = JobRecord(uuid.uuid4().int, source_type, config, **fields)
+        self._records[record.id] = record
+        return record
+
+    def add(self, record: JobRecord):
+        self._records[record.id] = record
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        key = parse_job_id(job_id)
+        return self._records.get(key) if key is not None else None
+
+    def __contains__(self, job_id: str) -> bool:
+        return self.get(job_id) is not None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[JobRecord]:
+        return iter(self._records.values())
+
+    @property
+    def etag(self) -> str:
+        """ETag of the job list, O(1): the latest version changes with every added or changed job"""
+        return f'W/"{STORE_INSTANCE_ID}-{len(self._records)}-{_latest_version}"'
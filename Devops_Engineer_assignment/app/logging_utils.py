@@ -0,0 +1,99 @@
+"""Structured JSON logging and request correlation ids for the data collection service"""
+import contextvars
+import json
+import logging
+import os
+import re
+import sys
+import time
+import uuid
+from typing import Optional
+
+from fastapi import Request
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, stdlib json is the fallback
+    orjson = None
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# "json" emits one JSON object per line for Filebeat/Logstash, "text" keeps the legacy format
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+TEXT_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Key order of every JSON log line, built once
+JSON_LOG_KEYS = ("timestamp", "level", "logger", "request_id", "job_id", "message")
+# uvicorn installs its own plain text handlers on these, they are routed to the root handler instead
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+REQUEST_ID_HEADER = "X-Request-ID"
+VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+job_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("job_id", default=None)
+
+
+class JsonLogFormatter(logging.Formatter):
+    """Single line JSON formatter with a fixed key order and a cached per-second timestamp prefix"""
+
+    def __init__(self):
+        super().__init__()
+        self._cached_second = None
+        self._cached_prefix = ""
+
+    def _timestamp(self, created: float) -> str:
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_second = second
+            self._cached_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return "%s.%03dZ" % (self._cached_prefix, (created - second) * 1000)
+
+    def format(self, record: logging.LogRecord) -> str:
+        values = (
+            self._timestamp(record.created),
+            record.levelname,
+            record.name,
+            request_id_var.get(),
+            job_id_var.get(),
+            record.getMessage(),
+        )
+        log_entry = dict(zip(JSON_LOG_KEYS, values))
+        if record.exc_info:
+            log_entry["exception"] = self.formatException(record.exc_info)
+        if orjson is not None:
+            return orjson.dumps(log_entry, default=str).decode("utf-8")
+        return json.dumps(log_entry, separators=(",", ":"), default=str)
+
+
+def configure_logging() -> None:
+    """Install a single stdout handler on the root logger using the configured format, uvicorn's loggers included"""
+    handler = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "json":
+        handler.setFormatter(JsonLogFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_LOG_FORMAT))
+    logging.basicConfig(level=LOG_LEVEL, handlers=[handler], force=True)
+    # The uvicorn CLI configures its loggers before importing the app, so they are reset here
+    for name in UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+
+
+def request_id_headers() -> dict:
+    """Outbound header carrying the current request id, empty outside of a request"""
+    request_id = request_id_var.get()
+    return {REQUEST_ID_HEADER: request_id} if request_id else {}
+
+
+async def request_id_middleware(request: Request, call_next):
+    """Attach a correlation id to the request context, every log line and the response"""
+    request_id = request.headers.get(REQUEST_ID_HEADER)
+    if not request_id or not VALID_REQUEST_ID.match(request_id):
+        request_id = uuid.uuid4().hex
+    # Not reset on return: uvicorn writes the access log line after this returns, in the same per-request task,
+    # and every request starts from a copy of the connection's context
+    request_id_var.set(request_id)
+    request.state.request_id = request_id
+    response = await call_next(request)
+    response.headers[REQUEST_ID_HEADER] = request_id
+    return response
@@ -1,32 +1,77 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
-from typing import Dict, Any, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Dict, Any, List, Literal, Optional
 import uuid
 import asyncio
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 import os
 
+from logging_utils import configure_logging, request_id_middleware, request_id_var, job_id_var
+from scheduler import Schedule, Scheduler
+from checkpoints import RESUMABLE_STATUSES, RESUME_SCAN_INTERVAL_SECONDS, Checkpointer, create_checkpoint_store, is_abandoned
+from collectors import get_collector, source_key
+from http_utils import json_response, not_modified
+from job_store import FINISHED_STATES, JobRecord, JobState, JobStore, iso_from_ms
+
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await resume_interrupted_jobs()
+    resume_task = asyncio.create_task(resume_loop())
+    await scheduler.start()
+    try:
+        yield
+    finally:
+        await scheduler.stop()
+        resume_task.cancel()
+        await asyncio.gather(resume_task, return_exceptions=True)
+        # Running jobs save a checkpoint when cancelled and are resumed by the next replica to start
+        for task in running_jobs.values():
+            task.cancel()
+        await asyncio.gather(*running_jobs.values(), return_exceptions=True)
+        await checkpoint_store.close()
+
 app = FastAPI(
     title="Data Collection Service",
     description="A service for collecting and processing data from various sources",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-# In-memory storage for demo (use Redis/Database in production)
-jobs_store: Dict[str, Dict[str, Any]] = {}
+app.middleware("http")(request_id_middleware)
+
+# In-memory storage for demo (use Redis/Database in production), compact records keyed by the int job id
+jobs_store = JobStore()
+# Watermarks and checkpoints of running jobs, in Redis when REDIS_URL is set
+checkpoint_store = create_checkpoint_store()
+# Strong references to running jobs (job_id -> task), asyncio only keeps weak ones
+running_jobs: Dict[str, asyncio.Task] = {}
+
+def check_run_options(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Reject run options a collector cannot page with"""
+    if config.get("page_size") is not None:
+        # Read with int() by the collectors, so a page size that int() accepts stays valid
+        try:
+            page_size = int(config["page_size"])
+        except (TypeError, ValueError):
+            page_size = 0
+        if page_size < 1:
+            raise ValueError("config.page_size must be an integer of at least 1")
+    return config
 
 class JobRequest(BaseModel):
     source_type: str = Field(..., pattern="^(api|database|file)$")
     config: Dict[str, Any] = Field(default_factory=dict)
+    # delta: continue from the source watermark of the last completed run
+    mode: Literal["full", "delta"] = "full"
+
+    _check_config = field_validator("config")(check_run_options)
 
 class JobResponse(BaseModel):
     job_id: str
@@ -47,6 +92,38 @@ class JobResult(BaseModel):
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
+class ScheduleRequest(BaseModel):
+    """Recurring job: a cron expression (UTC) or an interval, same field names as the DSaaS pipeline schedule"""
+    source_type: str = Field(..., pattern="^(api|database|file)$")
+    config: Dict[str, Any] = Field(default_factory=dict)
+    cron_expression: Optional[str] = None
+    every_hours: Optional[int] = Field(None, ge=1)
+    every_minutes: Optional[int] = Field(None, ge=1)
+    planned_end_date: Optional[datetime] = None
+    mode: Literal["full", "delta"] = "full"
+
+    _check_config = field_validator("config")(check_run_options)
+
+    @model_validator(mode="after")
+    def check_trigger(self):
+        has_interval = self.every_hours is not None or self.every_minutes is not None
+        if (self.cron_expression is not None) == has_interval:
+            raise ValueError("Provide either cron_expression or every_hours/every_minutes")
+        return self
+
+class ScheduleResponse(BaseModel):
+    schedule_id: str
+    source_type: str
+    config: Dict[str, Any]
+    cron_expression: Optional[str] = None
+    interval_seconds: Optional[int] = None
+    planned_end_date: Optional[str] = None
+    mode: str
+    next_run_at: Optional[str] = None
+    last_run_at: Optional[str] = None
+    last_job_id: Optional[str] = None
+    created_at: str
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint for load balancers and monitoring"""
@@ -72,122 +149,284 @@ async def health_check():
             }
         )
 
-async def process_job(job_id: str, source_type: str, config: Dict[str, Any]):
-    """Background task to process data collection job"""
+async def process_job(job: JobRecord):
+    """Background task to process data collection job, from its checkpoint, its source watermark or the start"""
+    job_id = job.job_id
+    source_type, config = job.source_type, job.config
+    request_id_var.set(job.request_id)
+    job_id_var.set(job_id)
+    # Resumed jobs were claimed before they were queued and this renews their lease, new jobs take a free one
+    if not await checkpoint_store.claim_job(job_id):
+        logger.warning(f"Job {job_id} was claimed by another replica before it started")
+        job.set_status(JobState.INTERRUPTED)
+        return
+    checkpointer = Checkpointer(checkpoint_store, job)
     try:
-        logger.info(f"Starting job {job_id} with source_type: {source_type}")
+        collector = get_collector(source_type, config)
+        key = source_key(source_type, config)
+        checkpoint = job.checkpoint
+        if checkpoint:
+            position, records = checkpoint["position"], checkpoint["records_processed"]
+            logger.info(f"Resuming job {job_id} from checkpoint {position}")
+        else:
+            position = await checkpoint_store.get_watermark(key) if job.mode == "delta" else None
+            records = 0
+            logger.info(f"Starting job {job_id} with source_type: {source_type}, mode: {job.mode}, from: {position}")
+        start_position = position
         
         # Update job status to processing
-        jobs_store[job_id]["status"] = "processing"
-        jobs_store[job_id]["updated_at"] = datetime.now(timezone.utc).isoformat()
+        job.set_status(JobState.PROCESSING)
+        await checkpointer.save()
         
-        # Simulate processing time based on source type
-        processing_times = {"api": 5, "database": 10, "file": 15}
-        await asyncio.sleep(processing_times.get(source_type, 5))
+        async for page in collector.pages(position):
+            position = page.position
+            records += page.records
+            job.update(progress=page.progress, checkpoint={"position": position, "records_processed": records})
+            await checkpointer.page_done()
         
-        # Simulate successful completion
-        jobs_store[job_id].update({
-            "status": "completed",
-            "result": {
-                "records_processed": 100,
+        # The watermark only moves once everything up to it was collected
+        if position is not None:
+            await checkpoint_store.set_watermark(key, position)
+        job.set_status(
+            JobState.COMPLETED,
+            progress=100,
+            result={
+                "records_processed": records,
                 "source_type": source_type,
-                "config_used": config
+                "config_used": config,
+                "mode": job.mode,
+                "start_position": start_position,
+                "watermark": position
             },
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        })
+            checkpoint=None
+        )
+        await checkpoint_store.delete_checkpoint(job_id)
         
         logger.info(f"Job {job_id} completed successfully")
         
+    except asyncio.CancelledError:
+        # Shutdown or eviction: keep the checkpoint so the job resumes on the next start
+        logger.warning(f"Job {job_id} interrupted, resumable from its checkpoint")
+        job.set_status(JobState.INTERRUPTED)
+        await checkpointer.save()
+        raise
     except Exception as e:
         logger.error(f"Job {job_id} failed: {str(e)}")
-        jobs_store[job_id].update({
-            "status": "failed",
-            "error": str(e),
-            "updated_at": datetime.now(timezone.utc).isoformat()
-        })
+        job.set_status(JobState.FAILED, error=str(e))
+        # Failed jobs are only resumed through the API, from the checkpoint kept on the job record
+        try:
+            await checkpoint_store.delete_checkpoint(job_id)
+        except Exception as delete_error:
+            logger.error(f"Could not delete checkpoint of job {job_id}: {delete_error}")
+    finally:
+        await checkpoint_store.release_job(job_id)
+
+def create_job(source_type: str, config: Dict[str, Any], request_id: Optional[str], schedule_id: Optional[str] = None,
+               mode: str = "full") -> JobRecord:
+    """Store a new queued job, start it with start_job"""
+    return jobs_store.create(source_type, config, mode=mode, request_id=request_id, schedule_id=schedule_id)
+
+def start_job(job: JobRecord):
+    job_id = job.job_id
+    task = asyncio.create_task(process_job(job))
+    running_jobs[job_id] = task
+    task.add_done_callback(lambda _: running_jobs.pop(job_id, None))
+
+async def resume_interrupted_jobs():
+    """Restart jobs whose process went away mid-run; jobs still owned by a live replica are left to it"""
+    for data in await checkpoint_store.load_checkpoints():
+        if data["job_id"] in running_jobs:
+            continue
+        if data.get("status") not in RESUMABLE_STATUSES or is_abandoned(data):
+            await checkpoint_store.delete_checkpoint(data["job_id"])
+            logger.info(f"Dropped stale checkpoint of job {data['job_id']}")
+        elif await checkpoint_store.claim_job(data["job_id"]):
+            job = JobRecord.from_dict(data)
+            jobs_store.add(job)
+            start_job(job)
+            logger.info(f"Job {job.job_id} queued for resumption")
+
+async def resume_loop():
+    """Rescan checkpoints, jobs of a crashed replica become claimable once their lease expired"""
+    while True:
+        await asyncio.sleep(RESUME_SCAN_INTERVAL_SECONDS)
+        try:
+            await resume_interrupted_jobs()
+        except Exception as e:
+            logger.error(f"Resume scan failed: {e}")
 
 @app.post("/api/v1/jobs/trigger", response_model=JobResponse)
-async def trigger_job(job_request: JobRequest, background_tasks: BackgroundTasks):
+async def trigger_job(job_request: JobRequest, request: Request):
     """Trigger a new data collection job"""
     try:
-        job_id = str(uuid.uuid4())
-        created_at = datetime.now(timezone.utc).isoformat()
-        
-        # Store job information
-        jobs_store[job_id] = {
-            "job_id": job_id,
-            "status": "queued",
-            "source_type": job_request.source_type,
-            "config": job_request.config,
-            "created_at": created_at,
-            "updated_at": created_at
-        }
+        job = create_job(job_request.source_type, job_request.config, request.state.request_id, mode=job_request.mode)
+        job_id = job.job_id
         
         # Start background processing
-        background_tasks.add_task(
-            process_job, 
-            job_id, 
-            job_request.source_type, 
-            job_request.config
-        )
+        start_job(job)
         
         logger.info(f"Job {job_id} queued for processing")
         
         return JobResponse(
             job_id=job_id,
-            status="queued",
-            created_at=created_at
+            status=JobState.QUEUED.value,
+            created_at=iso_from_ms(job.created_at)
         )
         
     except Exception as e:
         logger.error(f"Failed to trigger job: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to trigger job: {str(e)}")
 
+@app.post("/api/v1/jobs/{job_id}/resume", response_model=JobResponse)
+async def resume_job(job_id: str):
+    """Run a failed or interrupted job again from its last checkpoint"""
+    job = jobs_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status not in (JobState.FAILED, JobState.INTERRUPTED) or job.job_id in running_jobs:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status.value}, only failed or interrupted jobs can be resumed")
+    if not await checkpoint_store.claim_job(job.job_id):
+        raise HTTPException(status_code=409, detail="Job was resumed by another replica")
+    job.set_status(JobState.QUEUED, error=None)
+    start_job(job)
+    logger.info(f"Job {job.job_id} queued for resumption")
+    return JobResponse(job_id=job.job_id, status=JobState.QUEUED.value, created_at=iso_from_ms(job.created_at))
+
+async def run_scheduled_job(schedule: Schedule) -> str:
+    """Fire one run of a schedule, called by the scheduler on the leader replica"""
+    job = create_job(schedule.source_type, schedule.config, uuid.uuid4().hex, schedule.schedule_id, schedule.mode)
+    start_job(job)
+    logger.info(f"Job {job.job_id} queued by schedule {schedule.schedule_id}")
+    return job.job_id
+
+scheduler = Scheduler(run_scheduled_job)
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat() if timestamp is not None else None
+
+def schedule_response(schedule: Schedule) -> ScheduleResponse:
+    return ScheduleResponse(
+        schedule_id=schedule.schedule_id,
+        source_type=schedule.source_type,
+        config=schedule.config,
+        cron_expression=schedule.cron_expression,
+        interval_seconds=schedule.interval_seconds,
+        planned_end_date=_iso(schedule.end_at),
+        mode=schedule.mode,
+        next_run_at=_iso(schedule.next_run_at),
+        last_run_at=_iso(schedule.last_run_at),
+        last_job_id=schedule.last_job_id,
+        created_at=_iso(schedule.created_at)
+    )
+
+@app.post("/api/v1/schedules", response_model=ScheduleResponse, status_code=201)
+async def create_schedule(schedule_request: ScheduleRequest):
+    """Create a recurring data collection job"""
+    interval_seconds = None
+    if schedule_request.cron_expression is None:
+        interval_seconds = (schedule_request.every_hours or 0) * 3600 + (schedule_request.every_minutes or 0) * 60
+    end_date = schedule_request.planned_end_date
+    if end_date is not None and end_date.tzinfo is None:
+        end_date = end_date.replace(tzinfo=timezone.utc)
+    try:
+        schedule = Schedule(
+            schedule_id=str(uuid.uuid4()),
+            source_type=schedule_request.source_type,
+            config=schedule_request.config,
+            cron_expression=schedule_request.cron_expression,
+            interval_seconds=interval_seconds,
+            end_at=end_date.timestamp() if end_date else None,
+            mode=schedule_request.mode
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    try:
+        await scheduler.add(schedule)
+    except Exception as e:
+        logger.error(f"Failed to create schedule: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to create schedule: {str(e)}")
+    return schedule_response(schedule)
+
+@app.get("/api/v1/schedules")
+async def list_schedules():
+    """List all schedules with their next run"""
+    schedules: List[ScheduleResponse] = [schedule_response(schedule) for schedule in scheduler.schedules.values()]
+    return {
+        "schedules": schedules,
+        "total": len(schedules)
+    }
+
+@app.get("/api/v1/schedules/{schedule_id}", response_model=ScheduleResponse)
+async def get_schedule(schedule_id: str):
+    """Get one schedule"""
+    schedule = scheduler.get(schedule_id)
+    if schedule is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return schedule_response(schedule)
+
+@app.delete("/api/v1/schedules/{schedule_id}", status_code=204)
+async def delete_schedule(schedule_id: str):
+    """Stop a recurring job, runs already started are not affected"""
+    if not await scheduler.remove(schedule_id):
+        raise HTTPException(status_code=404, detail="Schedule not found")
+
 @app.get("/api/v1/jobs/status/{job_id}", response_model=JobStatus)
-async def get_job_status(job_id: str):
-    """Get the status of a specific job"""
-    if job_id not in jobs_store:
+async def get_job_status(job_id: str, request: Request):
+    """Get the status of a specific job, 304 when If-None-Match holds the current ETag"""
+    job = jobs_store.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = jobs_store[job_id]
-    return JobStatus(
-        job_id=job["job_id"],
-        status=job["status"],
-        progress=job.get("progress"),
-        message=job.get("message"),
-        created_at=job["created_at"],
-        updated_at=job["updated_at"]
-    )
+    etag = job.etag
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    return json_response(request, {
+        "job_id": job.job_id,
+        "status": job.status.value,
+        "progress": job.progress,
+        "message": None,
+        "created_at": iso_from_ms(job.created_at),
+        "updated_at": iso_from_ms(job.updated_at)
+    }, etag)
 
 @app.get("/api/v1/jobs/result/{job_id}", response_model=JobResult)
-async def get_job_result(job_id: str):
-    """Get the result of a completed job"""
-    if job_id not in jobs_store:
+async def get_job_result(job_id: str, request: Request):
+    """Get the result of a completed job, 304 when If-None-Match holds the current ETag"""
+    job = jobs_store.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job = jobs_store[job_id]
-    
-    if job["status"] not in ["completed", "failed"]:
+    if job.status not in FINISHED_STATES:
         raise HTTPException(
             status_code=400, 
-            detail=f"Job is still {job['status']}. Results not available yet."
+            detail=f"Job is still {job.status.value}. Results not available yet."
         )
     
-    return JobResult(
-        job_id=job["job_id"],
-        status=job["status"],
-        result=job.get("result"),
-        error=job.get("error")
-    )
+    etag = job.etag
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    return json_response(request, {
+        "job_id": job.job_id,
+        "status": job.status.value,
+        "result": job.result,
+        "error": job.error
+    }, etag)
 
 @app.get("/api/v1/jobs")
-async def list_jobs():
+async def list_jobs(request: Request):
     """List all jobs with their current status"""
-    return {
-        "jobs": list(jobs_store.values()),
+    etag = jobs_store.etag
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    return json_response(request, {
+        "jobs": [job.to_api_dict() for job in jobs_store],
         "total": len(jobs_store)
-    }
+    }, etag)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # log_config=None keeps the JSON handler configure_logging installed
+    uvicorn.run(app, host="0.0.0.0", port=8000, log_config=None)
\ No newline at end of file
@@ -0,0 +1,483 @@
+"""Recurring job schedules: cron and interval triggers on an in-process timer heap, fired by one replica at a time
+
+Every replica keeps all schedules in a min-heap ordered by next run time and sleeps until the earliest one,
+so a wakeup costs O(log n) however many schedules exist. Updates and deletes bump a per-schedule version and
+leave the old heap entry behind; stale entries are skipped when popped and the heap is compacted when they
+outnumber the live ones.
+
+Ownership: with REDIS_URL set, schedules are stored in Redis and replicas compete for a leader lease. Only the
+lease holder fires schedules, and only while its lease is known to be valid, so a paused leader cannot fire
+after another replica took over. Without Redis the process owns everything and schedules live in memory.
+
+Sync: every write bumps a store version and records the schedule id in a change log scored by that version.
+Replicas poll the version with each lease renewal and re-read only the schedules changed since the version they
+hold; a replica's own writes advance its version directly. The whole hash is only loaded on startup, or when
+the bounded change log no longer reaches back to a replica's version.
+
+Missed runs (downtime, failover) are not replayed: a schedule loaded or taken over fires at its next run after now.
+"""
+import asyncio
+import bisect
+import heapq
+import itertools
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # redis is only needed for multi-replica ownership
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+SCHEDULES_KEY = "dcs:schedules"
+SCHEDULES_VERSION_KEY = "dcs:schedules:version"
+# schedule_id scored by the store version of its latest change; versions at or below the floor were trimmed
+SCHEDULES_CHANGES_KEY = "dcs:schedules:changes"
+SCHEDULES_CHANGES_FLOOR_KEY = "dcs:schedules:changes:floor"
+SCHEDULES_CHANGES_MAX = int(os.getenv("SCHEDULES_CHANGES_MAX", "10000"))
+LEADER_KEY = "dcs:scheduler:leader"
+# The leader renews every LEASE_RENEW_SECONDS and stops firing LEASE_SAFETY_SECONDS before its lease runs out
+LEASE_TTL_SECONDS = float(os.getenv("SCHEDULER_LEASE_TTL_SECONDS", "15"))
+LEASE_RENEW_SECONDS = LEASE_TTL_SECONDS / 3
+LEASE_SAFETY_SECONDS = 1.0
+# Cron searches give up after this many years without a match ("0 0 30 2 *")
+CRON_SEARCH_YEARS = 5
+
+CRON_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+# (minimum, maximum) of the five cron fields; day of week accepts 7 for Sunday
+CRON_FIELD_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+
+def _parse_cron_field(text: str, minimum: int, maximum: int) -> FrozenSet[int]:
+    values = set()
+    for part in text.split(","):
+        expression, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if expression == "*":
+            start, end = minimum, maximum
+        elif "-" in expression:
+            start_text, end_text = expression.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(expression)
+            # "5/15" means every 15 starting at 5
+            end = maximum if step_text else start
+        if step < 1 or start < minimum or end > maximum or start > end:
+            raise ValueError(f"Invalid cron field '{text}', allowed range {minimum}-{maximum}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronExpression:
+    """Standard five field cron expression (minute hour day-of-month month day-of-week), evaluated in UTC"""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        fields = CRON_MACROS.get(expression.strip(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression '{expression}' must have 5 fields")
+        try:
+            parsed = [_parse_cron_field(text, *limits) for text, limits in zip(fields, CRON_FIELD_RANGES)]
+        except ValueError as e:
+            raise ValueError(f"Invalid cron expression '{expression}': {e}") from None
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self._sorted_minutes, self._sorted_hours = sorted(self.minutes), sorted(self.hours)
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        # Cron rule: when both day fields are restricted a day matching either one fires
+        self._days_restricted = fields[2] != "*"
+        self._weekdays_restricted = fields[4] != "*"
+        self.next_after(time.time())  # fail now for expressions that never fire
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        # datetime: Monday is 0, cron: Sunday is 0
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._days_restricted and self._weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, timestamp: float) -> float:
+        """First matching minute strictly after timestamp, skipping whole months/days/hours that cannot match"""
+        moment = datetime.fromtimestamp(timestamp, timezone.utc).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        give_up = moment.year + CRON_SEARCH_YEARS
+        while moment.year <= give_up:
+            if moment.month not in self.months:
+                year, month = (moment.year + 1, 1) if moment.month == 12 else (moment.year, moment.month + 1)
+                moment = moment.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(moment):
+                moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+            elif moment.hour not in self.hours:
+                index = bisect.bisect_left(self._sorted_hours, moment.hour)
+                if index == len(self._sorted_hours):
+                    moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+                else:
+                    moment = moment.replace(hour=self._sorted_hours[index], minute=0)
+            elif moment.minute not in self.minutes:
+                index = bisect.bisect_left(self._sorted_minutes, moment.minute)
+                if index == len(self._sorted_minutes):
+                    moment = (moment + timedelta(hours=1)).replace(minute=0)
+                else:
+                    moment = moment.replace(minute=self._sorted_minutes[index])
+            else:
+                return moment.timestamp()
+        raise ValueError(f"Cron expression '{self.expression}' never fires")
+
+
+@dataclass
+class Schedule:
+    schedule_id: str
+    source_type: str
+    config: Dict[str, Any]
+    cron_expression: Optional[str] = None
+    interval_seconds: Optional[int] = None
+    end_at: Optional[float] = None
+    created_at: float = field(default_factory=time.time)
+    # "delta" runs continue from the watermark of the previous run
+    mode: str = "full"
+    # Runtime state, not persisted
+    next_run_at: Optional[float] = field(default=None, compare=False)
+    last_run_at: Optional[float] = field(default=None, compare=False)
+    last_job_id: Optional[str] = field(default=None, compare=False)
+    version: int = field(default=0, compare=False)
+
+    def __post_init__(self):
+        if (self.cron_expression is None) == (self.interval_seconds is None):
+            raise ValueError("A schedule needs exactly one of cron_expression or an interval")
+        self._cron = CronExpression(self.cron_expression) if self.cron_expression else None
+
+    def next_run_after(self, timestamp: float) -> Optional[float]:
+        """Next run strictly after timestamp, None once the schedule has ended"""
+        if self._cron is not None:
+            next_run = self._cron.next_after(timestamp)
+        else:
+            # Intervals are anchored at creation, so restarts do not shift them
+            elapsed = max(timestamp - self.created_at, 0)
+            next_run = self.created_at + (int(elapsed // self.interval_seconds) + 1) * self.interval_seconds
+        if self.end_at is not None and next_run > self.end_at:
+            return None
+        return next_run
+
+    def to_record(self) -> str:
+        record = {key: value for key, value in asdict(self).items()
+                  if key not in ("next_run_at", "last_run_at", "last_job_id", "version")}
+        return json.dumps(record, separators=(",", ":"))
+
+    @classmethod
+    def from_record(cls, record: str) -> "Schedule":
+        return cls(**json.loads(record))
+
+
+class MemoryBackend:
+    """Single replica: this process always leads and schedules only live in memory"""
+
+    async def acquire_lease(self) -> bool:
+        return True
+
+    async def release_lease(self):
+        pass
+
+    async def save(self, schedule: Schedule) -> Optional[int]:
+        return None
+
+    async def delete(self, schedule_id: str) -> Optional[int]:
+        return None
+
+    async def changes(self, since: Optional[int]) -> Tuple[Optional[int], Optional[Dict[str, Optional[Schedule]]]]:
+        return None, {}
+
+    async def load_all(self) -> List[Schedule]:
+        return []
+
+    async def close(self):
+        pass
+
+
+# Extend the lease only if this replica still holds it, otherwise take it when free
+RENEW_LEASE_SCRIPT = """
+local holder = redis.call('GET', KEYS[1])
+if holder == ARGV[1] then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+if not holder then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+    return 1
+end
+return 0
+"""
+RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+# KEYS: schedules, version, changes, changes floor. ARGV: schedule_id, change log size, record (absent to delete).
+# Returns the store version of this change
+WRITE_SCHEDULE_SCRIPT = """
+local version = redis.call('INCR', KEYS[2])
+if ARGV[3] then
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[3])
+else
+    redis.call('HDEL', KEYS[1], ARGV[1])
+end
+redis.call('ZADD', KEYS[3], version, ARGV[1])
+local excess = redis.call('ZCARD', KEYS[3]) - tonumber(ARGV[2])
+if excess > 0 then
+    local trimmed = redis.call('ZRANGE', KEYS[3], excess - 1, excess - 1, 'WITHSCORES')
+    redis.call('SET', KEYS[4], trimmed[2])
+    redis.call('ZREMRANGEBYRANK', KEYS[3], 0, excess - 1)
+end
+return version
+"""
+
+
+class RedisBackend:
+    """Schedules in a Redis hash (schedule_id -> record) plus a change counter, and the leader lease"""
+
+    def __init__(self, redis_url: str):
+        self.owner = f"{os.getenv('HOSTNAME', 'local')}:{uuid.uuid4().hex[:8]}"
+        self._client = redis_asyncio.from_url(redis_url, decode_responses=True)
+        self._renew = self._client.register_script(RENEW_LEASE_SCRIPT)
+        self._release = self._client.register_script(RELEASE_LEASE_SCRIPT)
+        self._write = self._client.register_script(WRITE_SCHEDULE_SCRIPT)
+
+    async def acquire_lease(self) -> bool:
+        ttl_ms = int(LEASE_TTL_SECONDS * 1000)
+        return bool(await self._renew(keys=[LEADER_KEY], args=[self.owner, ttl_ms]))
+
+    async def release_lease(self):
+        await self._release(keys=[LEADER_KEY], args=[self.owner])
+
+    async def _write_schedule(self, schedule_id: str, *record: str) -> int:
+        keys = [SCHEDULES_KEY, SCHEDULES_VERSION_KEY, SCHEDULES_CHANGES_KEY, SCHEDULES_CHANGES_FLOOR_KEY]
+        return int(await self._write(keys=keys, args=[schedule_id, SCHEDULES_CHANGES_MAX, *record]))
+
+    async def save(self, schedule: Schedule) -> Optional[int]:
+        return await self._write_schedule(schedule.schedule_id, schedule.to_record())
+
+    async def delete(self, schedule_id: str) -> Optional[int]:
+        return await self._write_schedule(schedule_id)
+
+    async def changes(self, since: Optional[int]) -> Tuple[Optional[int], Optional[Dict[str, Optional[Schedule]]]]:
+        """
+        Current store version and the schedules changed after since (None for removed ones). The changes are
+        None when since is None or older than the change log, the caller then reloads everything
+        """
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.get(SCHEDULES_VERSION_KEY).get(SCHEDULES_CHANGES_FLOOR_KEY)
+            pipe.zrangebyscore(SCHEDULES_CHANGES_KEY, f"({since or 0}", "+inf")
+            version, floor, schedule_ids = await pipe.execute()
+        version = int(version or 0)
+        if since is None or since < int(floor or 0):
+            return version, None
+        if version == since or not schedule_ids:
+            return version, {}
+        changed = {}
+        for schedule_id, record in zip(schedule_ids, await self._client.hmget(SCHEDULES_KEY, schedule_ids)):
+            try:
+                changed[schedule_id] = Schedule.from_record(record) if record is not None else None
+            except (ValueError, TypeError) as e:
+                logger.error(f"Skipping invalid schedule {schedule_id}: {e}")
+        return version, changed
+
+    async def load_all(self) -> List[Schedule]:
+        records = await self._client.hgetall(SCHEDULES_KEY)
+        schedules = []
+        for schedule_id, record in records.items():
+            try:
+                schedules.append(Schedule.from_record(record))
+            except (ValueError, TypeError) as e:
+                logger.error(f"Skipping invalid schedule {schedule_id}: {e}")
+        return schedules
+
+    async def close(self):
+        await self._client.aclose()
+
+
+def create_backend():
+    if REDIS_URL and redis_asyncio is not None:
+        return RedisBackend(REDIS_URL)
+    if REDIS_URL:
+        logger.warning("REDIS_URL is set but the redis package is missing, schedules stay in memory")
+    return MemoryBackend()
+
+
+class Scheduler:
+    """Timer heap of (next_run_at, sequence, schedule_id, version) entries"""
+
+    def __init__(self, fire: Callable[[Schedule], Awaitable[Optional[str]]], backend=None):
+        self._fire = fire
+        self.backend = backend or create_backend()
+        self.schedules: Dict[str, Schedule] = {}
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._sequence = itertools.count()
+        self._stale_entries = 0
+        self._wakeup = asyncio.Event()
+        self._leader_until = 0.0
+        self._store_version: Optional[int] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def is_leader(self) -> bool:
+        return time.monotonic() < self._leader_until
+
+    # Heap maintenance
+
+    def _push(self, schedule: Schedule, now: float):
+        schedule.next_run_at = schedule.next_run_after(now)
+        if schedule.next_run_at is None:
+            return
+        entry = (schedule.next_run_at, next(self._sequence), schedule.schedule_id, schedule.version)
+        heapq.heappush(self._heap, entry)
+        # Only a new earliest entry changes how long the timer loop sleeps
+        if self._heap[0] is entry:
+            self._wakeup.set()
+
+    def _retire(self, schedule: Schedule):
+        """Invalidate the heap entry of a schedule being replaced or removed"""
+        schedule.version += 1
+        if schedule.next_run_at is not None:
+            self._stale_entries += 1
+        if self._stale_entries > max(len(self.schedules), 64):
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
+            self._stale_entries = 0
+
+    def _is_live(self, entry) -> bool:
+        schedule = self.schedules.get(entry[2])
+        return schedule is not None and schedule.version == entry[3]
+
+    def _apply(self, schedule: Schedule, now: float):
+        previous = self.schedules.get(schedule.schedule_id)
+        if previous is not None:
+            self._retire(previous)
+            schedule.version = previous.version
+            schedule.last_run_at, schedule.last_job_id = previous.last_run_at, previous.last_job_id
+        self.schedules[schedule.schedule_id] = schedule
+        self._push(schedule, now)
+
+    def _discard(self, schedule_id: str):
+        schedule = self.schedules.pop(schedule_id, None)
+        if schedule is not None:
+            self._retire(schedule)
+
+    # Public API
+
+    def _wrote(self, version: Optional[int]):
+        """Advance the store version past this replica's own write, unless writes of others came in between"""
+        if version is not None and self._store_version == version - 1:
+            self._store_version = version
+
+    async def add(self, schedule: Schedule) -> Schedule:
+        version = await self.backend.save(schedule)
+        self._apply(schedule, time.time())
+        self._wrote(version)
+        logger.info(f"Schedule {schedule.schedule_id} added, next run at {schedule.next_run_at}")
+        return schedule
+
+    async def remove(self, schedule_id: str) -> bool:
+        if schedule_id not in self.schedules:
+            return False
+        version = await self.backend.delete(schedule_id)
+        self._discard(schedule_id)
+        self._wrote(version)
+        logger.info(f"Schedule {schedule_id} removed")
+        return True
+
+    def get(self, schedule_id: str) -> Optional[Schedule]:
+        return self.schedules.get(schedule_id)
+
+    # Background loops
+
+    async def _sync(self):
+        """Apply the schedules other replicas changed, or load them all on startup"""
+        version, changed = await self.backend.changes(self._store_version)
+        if version is None or version == self._store_version:
+            return
+        now = time.time()
+        if changed is None:
+            schedules = {schedule.schedule_id: schedule for schedule in await self.backend.load_all()}
+            for schedule_id in [schedule_id for schedule_id in self.schedules if schedule_id not in schedules]:
+                self._discard(schedule_id)
+            changed = schedules
+        for schedule_id, schedule in changed.items():
+            if schedule is None:
+                self._discard(schedule_id)
+            elif self.schedules.get(schedule_id) != schedule:
+                self._apply(schedule, now)
+        self._store_version = version
+        logger.info(f"Applied {len(changed)} schedule changes, {len(self.schedules)} schedules (store version {version})")
+
+    async def _lease_loop(self):
+        while True:
+            started = time.monotonic()
+            try:
+                was_leader = self.is_leader
+                if await self.backend.acquire_lease():
+                    self._leader_until = started + LEASE_TTL_SECONDS - LEASE_SAFETY_SECONDS
+                    if not was_leader:
+                        logger.info("Acquired scheduler leadership")
+                elif was_leader:
+                    self._leader_until = 0.0
+                    logger.warning("Lost scheduler leadership")
+                await self._sync()
+            except Exception as e:
+                logger.error(f"Scheduler lease renewal failed: {e}")
+            await asyncio.sleep(LEASE_RENEW_SECONDS)
+
+    async def _timer_loop(self):
+        while True:
+            heap = self._heap  # compaction swaps the list
+            if not heap:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                continue
+            delay = heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+            entry = heapq.heappop(heap)
+            if not self._is_live(entry):
+                self._stale_entries = max(self._stale_entries - 1, 0)
+                continue
+            schedule = self.schedules[entry[2]]
+            if self.is_leader:
+                try:
+                    schedule.last_job_id = await self._fire(schedule)
+                    schedule.last_run_at = entry[0]
+                except Exception:
+                    logger.exception(f"Schedule {schedule.schedule_id} failed to fire")
+            self._push(schedule, max(entry[0], time.time()))
+
+    async def start(self):
+        await self._sync()
+        self._tasks = [asyncio.create_task(self._lease_loop()), asyncio.create_task(self._timer_loop())]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self.is_leader:
+            # Hand over right away instead of letting the lease time out
+            await self.backend.release_lease()
+        await self.backend.close()
@@ -0,0 +1,156 @@
+"""
+Memory and throughput of the in-memory job store at scale, dict records vs JobRecord (app/job_store.py).
+
+Layouts:
+  dict       the former layout: {str uuid: dict} with ISO timestamp strings, rebuilt on every status change
+  record     JobStore of JobRecord: int uuid keys, __slots__, epoch milliseconds, interned JobState
+
+Each layout is measured in its own subprocess so RSS deltas do not include the other layout's freed memory.
+Metrics: RSS growth after storing --jobs queued jobs, bytes per job, status lookups per second by API job id and
+status updates (processing + progress) per second. A record lookup includes rendering the ISO timestamps the status
+endpoint returns, which the dict layout keeps pre-rendered, so it trades lookup speed for memory and update speed.
+
+Usage (from Devops_Engineer_assignment):
+    python -m benchmarks.bench_job_store [--jobs 1000000] [--ops 200000] [--json]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+from job_store import JobState, JobStore, iso_from_ms  # noqa: E402
+
+SOURCE_TYPES = ("api", "database", "file")
+CONFIG = {"source_id": "orders", "page_size": 100}
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def fill_dict(jobs: int):
+    store = {}
+    for index in range(jobs):
+        job_id = str(uuid.uuid4())
+        created_at = datetime.now(timezone.utc).isoformat()
+        store[job_id] = {
+            "job_id": job_id,
+            "status": "queued",
+            "source_type": SOURCE_TYPES[index % 3],
+            "config": CONFIG,
+            "mode": "full",
+            "request_id": None,
+            "schedule_id": None,
+            "created_at": created_at,
+            "updated_at": created_at
+        }
+    return store
+
+
+def fill_record(jobs: int):
+    store = JobStore()
+    for index in range(jobs):
+        store.create(SOURCE_TYPES[index % 3], CONFIG)
+    return store
+
+
+def lookup_dict(store, job_id):
+    job = store[job_id]
+    return job["status"], job.get("progress"), job["created_at"], job["updated_at"]
+
+
+def lookup_record(store, job_id):
+    job = store.get(job_id)
+    return job.status.value, job.progress, iso_from_ms(job.created_at), iso_from_ms(job.updated_at)
+
+
+def update_dict(store, job_id):
+    job = store[job_id]
+    job["status"] = "processing"
+    job["progress"] = 50
+    job["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+
+def update_record(store, job_id):
+    store.get(job_id).set_status(JobState.PROCESSING, progress=50)
+
+
+LAYOUTS = {
+    "dict": (fill_dict, lookup_dict, update_dict),
+    "record": (fill_record, lookup_record, update_record),
+}
+
+
+def measure(layout: str, jobs: int, ops: int) -> dict:
+    fill, lookup, update = LAYOUTS[layout]
+    gc.collect()
+    before = rss_bytes()
+    started = time.perf_counter()
+    store = fill(jobs)
+    fill_seconds = time.perf_counter() - started
+    gc.collect()
+    rss = rss_bytes() - before
+
+    # API job ids to look up, drawn after the RSS reading
+    sample = random.Random(42).choices(list(store) if layout == "dict" else list(store._records), k=ops)
+    if layout == "record":
+        sample = [str(uuid.UUID(int=key)) for key in sample]
+    started = time.perf_counter()
+    for job_id in sample:
+        lookup(store, job_id)
+    lookup_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    for job_id in sample:
+        update(store, job_id)
+    update_seconds = time.perf_counter() - started
+    return {
+        "layout": layout,
+        "jobs": jobs,
+        "rss_mib": round(rss / 2 ** 20, 1),
+        "bytes_per_job": round(rss / jobs),
+        "fill_seconds": round(fill_seconds, 2),
+        "lookups_per_second": round(ops / lookup_seconds),
+        "updates_per_second": round(ops / update_seconds),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=1_000_000, help="jobs stored per layout")
+    parser.add_argument("--ops", type=int, default=200_000, help="lookups and updates timed per layout")
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    parser.add_argument("--layout", choices=LAYOUTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.layout:
+        # Child process: measure one layout
+        print(json.dumps(measure(args.layout, args.jobs, args.ops)))
+        return
+    results = []
+    for layout in LAYOUTS:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_job_store", "--layout", layout, "--jobs", str(args.jobs),
+             "--ops", str(args.ops)],
+            check=True, capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout
+        results.append(json.loads(output))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'layout':<8} {'jobs':>9} {'RSS MiB':>8} {'B/job':>6} {'fill s':>7} {'lookups/s':>10} {'updates/s':>10}")
+    for result in results:
+        print(f"{result['layout']:<8} {result['jobs']:>9} {result['rss_mib']:>8.1f} {result['bytes_per_job']:>6} "
+              f"{result['fill_seconds']:>7.2f} {result['lookups_per_second']:>10} {result['updates_per_second']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,83 @@
+from app.utils.StartupUtils import startup_profiler, load_deferred_modules, LAZY_STARTUP_ENABLED, STARTUP_WARMUP_DELAY_SECONDS
+startup_profiler.install()
+
 from fastapi import FastAPI, APIRouter, Request,HTTPException
-from fastapi.responses import JSONResponse
+from app.utils.ResponseUtils import FastJSONResponse, json_bytes_response, success_body, success_response, error_response, detail_response
 from fastapi.exceptions import RequestValidationError
-from app.routers import common_router
+from app.routers import common_router, admin_router
 from app.utils.LogUtils import logger
 from starlette.middleware.cors import CORSMiddleware
 from app.middleware.AuthMiddleware import okta_auth_middleware
+from app.middleware.RequestIdMiddleware import request_id_middleware
+from app.middleware.TimingMiddleware import timing_middleware
 from contextlib import asynccontextmanager
+import asyncio
 from app.utils.VaultClient import vault_client
+from app.utils.HttpClient import http_client
+from app.utils.RateLimiter import rate_limiter
+from app.utils.ExecutionTracker import execution_tracker
+from app.utils.getconfig import config_store, get_watch_interval
+from app.utils.PayloadBuilder import compile_payload_templates
+
+
+async def run_deferred_warmups():
+    """ Load deferred modules and authenticate with Vault once the pod is already serving """
+    try:
+        await asyncio.sleep(STARTUP_WARMUP_DELAY_SECONDS)
+        with startup_profiler.phase("warmup.deferred_imports"):
+            load_deferred_modules()
+        with startup_profiler.phase("warmup.vault_auth"):
+            await vault_client._authenticate()
+        logger.info("Vault client initialized and authenticated")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        # Not fatal, the first Vault read authenticates again
+        logger.error(f"Deferred warmup failed: {e}")
+    finally:
+        startup_profiler.log_report()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    config_watch_task = None
+    warmup_task = None
     try:
         #  Startup phase
         logger.info("Starting DSaaS Backend API...")
 
-        # Initialize Vault client (warm authentication)
-        await vault_client._authenticate()
-        logger.info("Vault client initialized and authenticated")
+        # Validate config before accepting traffic, then watch it for changes
+        with startup_profiler.phase("lifespan.config"):
+            config_store.load()
+        with startup_profiler.phase("lifespan.payload_templates"):
+            compile_payload_templates()
+        config_watch_task = asyncio.create_task(config_store.watch(get_watch_interval()))
+        execution_tracker.start()
+
+        if LAZY_STARTUP_ENABLED:
+            warmup_task = asyncio.create_task(run_deferred_warmups())
+        else:
+            # Initialize Vault client (warm authentication)
+            with startup_profiler.phase("lifespan.vault_auth"):
+                await vault_client._authenticate()
+            logger.info("Vault client initialized and authenticated")
+
+        startup_profiler.mark_ready()
+        if not LAZY_STARTUP_ENABLED:
+            startup_profiler.log_report()
 
         yield  # Run the API normally
 
     finally:
         #  Shutdown phase
         logger.info("Shutting down DSaaS Backend API...")
+        for task in (config_watch_task, warmup_task):
+            if task:
+                task.cancel()
+        await execution_tracker.stop()
         await vault_client.close()
+        await http_client.close()
+        await rate_limiter.close()
         logger.warning("Vault client closed successfully")
         
 
@@ -33,6 +87,7 @@ app = FastAPI(
     openapi_url=f"{API_VERSION}/openapi.json",
     docs_url=f"{API_VERSION}/docs",
     redoc_url=f"{API_VERSION}/redoc",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
     )
 
@@ -45,62 +100,46 @@ app.add_middleware(
 )
 
 app.middleware("http")(okta_auth_middleware)
+# Wraps auth, so the total in Server-Timing includes token verification
+app.middleware("http")(timing_middleware)
+# Registered last so it wraps auth as well and every log line carries the request id
+app.middleware("http")(request_id_middleware)
 
 @app.exception_handler(RequestValidationError)
 def validation_exception_handler(request:Request, exc:RequestValidationError):
     logger.error(f"Validation error: {exc.errors()}")
     error = exc.errors()[0]
-    return JSONResponse(
-        status_code=422,
-        content={
-            "status": "0",
-            "message": error['msg']
-        }
-    )
+    return error_response(error['msg'], status_code=422)
 
 @app.exception_handler(HTTPException)
 def validation_exception_handler(request:Request, exc:RequestValidationError):
     logger.error(f"Validation error: {exc.detail['message']}")
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=exc.detail
-    )
+    return detail_response(exc.detail, exc.status_code)
+
+# Constant bodies are encoded once at import
+ROOT_BODY = success_body("DSaaS Backend API", {})
+HEALTH_BODY = success_body("DSaaS Backend is healthy", {})
 
 router = APIRouter()
 @router.get("/", status_code=200)
 def dsaas_root():
     logger.info("DSaaS Backend API root endpoint called")
-    return JSONResponse(
-        status_code=200,
-        content={
-            "status": "1",
-            "message": "DSaaS Backend API",
-            "data": {}
-        }
-    )
+    return json_bytes_response(ROOT_BODY)
 
 @router.get("/health", status_code=200)
 def dsaas_health_check():
-    return JSONResponse(
-        status_code=200,
-        content={
-            "status": "1",
-            "message": "DSaaS Backend is healthy",
-            "data": {}
-        }
-    )
+    return json_bytes_response(HEALTH_BODY)
+
+@router.get("/startup", status_code=200)
+def dsaas_startup_report():
+    """ Cold start timing: slowest imports and lifespan/warmup phases of this worker """
+    return success_response("Startup report", startup_profiler.report())
 
 # Root level health endpoint for ALB
 @app.get("/health", status_code=200)
 def root_health_check():
-    return JSONResponse(
-        status_code=200,
-        content={
-            "status": "1",
-            "message": "DSaaS Backend is healthy",
-            "data": {}
-        }
-    )
+    return json_bytes_response(HEALTH_BODY)
 
 app.include_router(router,prefix=API_VERSION)   
-app.include_router(common_router, prefix=API_VERSION)
\ No newline at end of file
+app.include_router(common_router, prefix=API_VERSION)
+app.include_router(admin_router, prefix=API_VERSION)
\ No newline at end of file
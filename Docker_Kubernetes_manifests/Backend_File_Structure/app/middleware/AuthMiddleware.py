@@ -1,9 +1,17 @@
-import sys,os,requests,json,jwt
+import json,time
 from fastapi import HTTPException,Request
-from fastapi.responses import JSONResponse
-from app.utils.LogUtils import logger
+from app.utils.ResponseUtils import detail_response, json_bytes_response, error_body, UNEXPECTED_ERROR_BODY
+from app.utils.LogUtils import logger, request_id_headers
 from app.utils import CommonUtilsConstants
-from jwt.algorithms import RSAAlgorithm
+from app.utils.StartupUtils import lazy_import
+from app.utils.getconfig import get_settings
+from app.utils.HttpClient import http_client
+from app.utils.SharedCache import shared_cache
+from app.utils.RateLimiter import rate_limiter, route_template
+from app.utils.TimingUtils import timed
+
+# PyJWT pulls in cryptography, both are loaded after readiness in lazy startup mode
+jwt = lazy_import("jwt")
 # from utils.CommonUtils
 
 
@@ -15,6 +23,8 @@ EXCLUDED_PATHS = [
     "/health"  # For ALB health checks
 ]
 
+RATE_LIMITED_BODY = error_body("Too many requests. Please retry later.")
+
 
 def get_kid(token):
     """ Extract the 'kid' from the JWT header """
@@ -24,18 +34,57 @@ def get_kid(token):
     except Exception:
         return None
 
-def get_public_key(kid):
+async def fetch_jwks():
+    """ Download Okta's JWKS on the shared pooled session """
+    session = http_client.get_session()
+    async with session.get(get_settings().okta_jwks_url, headers=request_id_headers()) as resp:
+        if resp.status != 200:
+            raise Exception(f"JWKS fetch failed: {resp.status}")
+        jwks = await resp.json()
+    logger.info("Fetched Okta JWKS")
+    # fetched_at tells workers that the shared document changed and parsed keys must be rebuilt
+    return {"keys": jwks.get("keys"), "fetched_at": time.time()}
+
+# Parsed public keys of this worker (kid -> key) for the JWKS document fetched at _parsed_keys_fetched_at
+_parsed_keys = {}
+_parsed_keys_fetched_at = None
+_last_forced_refresh = 0.0
+
+async def get_jwks(force_refresh=False):
+    """ JWKS from the cache shared by all workers, fetched from Okta at most once per TTL """
+    if force_refresh:
+        await shared_cache.delete(CommonUtilsConstants.JWKS_CACHE_KEY)
+    return await shared_cache.get_or_load(
+        CommonUtilsConstants.JWKS_CACHE_KEY, CommonUtilsConstants.JWKS_CACHE_TTL_SECONDS, fetch_jwks
+    )
+
+async def get_public_key(kid):
     """ Get the public key from Okta's JWKS """
+    global _parsed_keys, _parsed_keys_fetched_at, _last_forced_refresh
     try:
-        jwks = requests.get(CommonUtilsConstants.OKTA_JWKS_URL).json()
-        if "keys" not in jwks:
+        with timed("jwks"):
+            jwks = await get_jwks()
+        if not jwks.get("keys"):
             raise HTTPException(
                 status_code=500,
                 detail={"status": "0", "message": "Malformed JWKS response"}
             )
+        if not any(key["kid"] == kid for key in jwks["keys"]) and \
+                time.monotonic() - _last_forced_refresh > CommonUtilsConstants.JWKS_MIN_REFRESH_SECONDS:
+            # Unknown kid, Okta may have rotated its signing key
+            _last_forced_refresh = time.monotonic()
+            with timed("jwks"):
+                jwks = await get_jwks(force_refresh=True)
+        if jwks["fetched_at"] != _parsed_keys_fetched_at:
+            _parsed_keys, _parsed_keys_fetched_at = {}, jwks["fetched_at"]
+        public_key = _parsed_keys.get(kid)
+        if public_key is not None:
+            return public_key
         for key in jwks["keys"]:
             if key["kid"] == kid:
-                return RSAAlgorithm.from_jwk(json.dumps(key))
+                public_key = jwt.algorithms.RSAAlgorithm.from_jwk(json.dumps(key))
+                _parsed_keys[kid] = public_key
+                return public_key
         raise HTTPException(
             status_code=401,
             detail={"status": "0", "message": "Invalid token signature"}
@@ -51,7 +100,7 @@ def get_public_key(kid):
                 }
         )
 
-def verify_jwt(token:str):
+async def verify_jwt(token:str):
     try:
         kid = get_kid(token)
         if not kid :
@@ -62,18 +111,17 @@ def verify_jwt(token:str):
                     "message":"Missing or Invalid Autherisation Token"
                 }
             )
-        public_key = get_public_key(kid)
-        print(public_key)
-        OKTA_CLIENT_ID = "0oa1i7c0qzmneJ54r358"
+        public_key = await get_public_key(kid)
+        settings = get_settings()
         decoded_token = jwt.decode(
             token,
             public_key,
             algorithms=["RS256"],
-            audience=CommonUtilsConstants.OKTA_AUDIENCE,
-            issuer=CommonUtilsConstants.OKTA_ISSUER
+            audience=settings.okta_audience,
+            issuer=settings.okta_issuer
         )
         # Validate that the token includes the correct client_id
-        if "client_id" in decoded_token and decoded_token["client_id"] != OKTA_CLIENT_ID:
+        if "client_id" in decoded_token and decoded_token["client_id"] != settings.okta_client_id:
             raise HTTPException(
                 status_code=401, 
                 detail={
@@ -106,7 +154,6 @@ def verify_jwt(token:str):
 
 async def okta_auth_middleware(request:Request, call_next ):
     try:
-        print(request.method)
         if request.method == "OPTIONS":
             return await call_next(request)
         if request.url.path in EXCLUDED_PATHS:
@@ -123,19 +170,27 @@ async def okta_auth_middleware(request:Request, call_next ):
         
         
         user_token = auth_header.split(" ")[1]
-        user = verify_jwt(user_token)
+        with timed("jwt"):
+            user = await verify_jwt(user_token)
         request.state.user = user # Attach user info to request
-        return await call_next(request)
+
+        # Limits are per user (sub), or per application for client credential tokens
+        client = user.get("sub") or user.get("client_id") or user.get("cid") or "anonymous"
+        route = route_template(request)
+        decision = await rate_limiter.check(client, route)
+        if decision is None:
+            return await call_next(request)
+        if not decision.allowed:
+            logger.warning(f"Rate limit exceeded for {client} on {route}")
+            response = json_bytes_response(RATE_LIMITED_BODY, 429)
+        else:
+            response = await call_next(request)
+        response.headers.update(decision.headers())
+        return response
         
     except HTTPException as ht:
-        return JSONResponse(
-            status_code=ht.status_code,
-            content= ht.detail
-        ) 
+        return detail_response(ht.detail, ht.status_code)
     except Exception as e:
         logger.info(e)
-        return JSONResponse(
-            status_code=500,
-            content= {"status":"0","message":"An unexpected error occurred. Please try again later."}
-        )
+        return json_bytes_response(UNEXPECTED_ERROR_BODY, 500)
     
\ No newline at end of file
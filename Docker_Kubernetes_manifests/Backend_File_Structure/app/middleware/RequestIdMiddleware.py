@@ -0,0 +1,22 @@
+import re
+import uuid
+from fastapi import Request
+from app.utils.LogUtils import REQUEST_ID_HEADER, request_id_var
+
+# Incoming ids are reused only when they look like an id, anything else is replaced
+VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+
+async def request_id_middleware(request: Request, call_next):
+    """ Attach a correlation id to the request context, every log line and the response """
+    request_id = request.headers.get(REQUEST_ID_HEADER)
+    if not request_id or not VALID_REQUEST_ID.match(request_id):
+        request_id = uuid.uuid4().hex
+    token = request_id_var.set(request_id)
+    try:
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers[REQUEST_ID_HEADER] = request_id
+        return response
+    finally:
+        request_id_var.reset(token)
@@ -0,0 +1,19 @@
+import time
+from fastapi import Request
+from app.utils.TimingUtils import SERVER_TIMING_HEADER, record_phase, request_timings_var, server_timing
+
+
+async def timing_middleware(request: Request, call_next):
+    """ Collect the phase timers of this request and report them in the Server-Timing header """
+    timings = []
+    token = request_timings_var.set(timings)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        request_timings_var.reset(token)
+    total_ms = (time.perf_counter() - started) * 1000
+    record_phase("total", total_ms)
+    timings.append(("total", total_ms))
+    response.headers[SERVER_TIMING_HEADER] = server_timing(timings)
+    return response
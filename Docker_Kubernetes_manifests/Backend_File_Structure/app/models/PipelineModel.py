@@ -0,0 +1,100 @@
+from pydantic import BaseModel, ConfigDict, model_validator
+from typing import List, Optional, Tuple, Type, Union, get_args
+from app.models.Models import CrossAccountPayload
+
+
+def _nested_model(annotation) -> Optional[Type[BaseModel]]:
+    """ Model class of a field annotation, looking through Optional/Union """
+    for candidate in (annotation, *get_args(annotation)):
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            return candidate
+    return None
+
+
+def _is_field_path(model: Type[BaseModel], path: str) -> bool:
+    """ True when every segment of the dotted path names a field of the model it is read from """
+    for name in path.split("."):
+        if model is None or name not in model.model_fields:
+            return False
+        model = _nested_model(model.model_fields[name].annotation)
+    return True
+
+
+class PipelineVariable(BaseModel):
+    """
+    One Harness pipeline variable.
+    source: dotted attribute path on the request payload ("project_details.apms_id") or a
+            request context key prefixed with "$" ("$requestor_email_id"). A list is tried in
+            order and the first non empty value wins.
+    value:  constant value.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    name: str
+    type: str = "String"
+    source: Optional[Union[str, Tuple[str, ...]]] = None
+    value: Optional[str] = None
+    default: str = ""
+
+    @model_validator(mode="after")
+    def _check_source_or_value(self):
+        if (self.source is None) == (self.value is None):
+            raise ValueError(f"Pipeline variable '{self.name}' needs exactly one of 'source' or 'value'")
+        return self
+
+
+class PipelineTemplate(BaseModel):
+    """
+    Variables of one pipeline type. Payload paths are checked against CrossAccountPayload here, so a
+    mistyped source is rejected with the config file instead of failing every request at render time.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    variables: Tuple[PipelineVariable, ...]
+
+    @model_validator(mode="after")
+    def _check_payload_paths(self):
+        for variable in self.variables:
+            sources = (variable.source,) if isinstance(variable.source, str) else variable.source or ()
+            for source in sources:
+                if not source.startswith("$") and not _is_field_path(CrossAccountPayload, source):
+                    raise ValueError(f"Pipeline variable '{variable.name}': '{source}' is not a field path of "
+                                     f"{CrossAccountPayload.__name__}")
+        return self
+
+
+def _var(name: str, source: Union[str, List[str], None] = None, value: Optional[str] = None) -> dict:
+    return {"name": name, "source": source, "value": value}
+
+
+# Default variable mapping of the cross account data sharing pipeline, used when the config file has no "pipelines"
+CROSS_ACCOUNT_VARIABLES = [
+    _var("apms_id", "project_details.apms_id"),
+    _var("ci_id", "project_details.ci_id"),
+    _var("vendor_name", ["cross_account.source_details.vendor_name", "cross_account.target_details.vendor_name"]),
+    _var("business_unit", "project_details.business_unit"),
+    _var("system_owner_email_id", "$requestor_email_id"),
+    _var("business_owner_email_id", "$requestor_email_id"),
+    _var("technical_owner_email_id", "$requestor_email_id"),
+    _var("data_classification", "project_details.data_classification"),
+    _var("source_s3_bucket_name", "cross_account.source_details.bucket"),
+    _var("source_s3_location", "cross_account.source_details.path"),
+    _var("source_file_format", "cross_account.source_details.file_format"),
+    _var("source_kms_arn", "cross_account.source_details.kms_arn"),
+    _var("target_s3_bucket_name", "cross_account.target_details.bucket"),
+    _var("target_s3_location", "cross_account.target_details.path"),
+    _var("target_kms_arn", "cross_account.target_details.kms_arn"),
+    _var("transfer_type", "project_details.transfer_type"),
+    _var("pipeline_frequency", ["cross_account.pipeline.schedule_type", "cross_account.pipeline.frequency"]),
+    _var("source_aws_region", "cross_account.source_details.region"),
+    _var("target_aws_region", "cross_account.target_details.region"),
+    _var("expired_after", "cross_account.pipeline.planned_end_date"),
+    _var("trigger_type", value="MANUAL"),
+    _var("scheduler_type", value=""),
+    _var("scheduler_time", ["cross_account.pipeline.time", "$current_datetime"]),
+    _var("is_active", value="Y"),
+    _var("cron_expression", "cross_account.pipeline.cron_expression"),
+]
+
+CROSS_ACCOUNT_PIPELINE = "cross_account"
+DEFAULT_PIPELINE_TEMPLATES = {CROSS_ACCOUNT_PIPELINE: {"variables": CROSS_ACCOUNT_VARIABLES}}
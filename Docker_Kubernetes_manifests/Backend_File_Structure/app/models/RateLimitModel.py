@@ -0,0 +1,52 @@
+import math
+from types import MappingProxyType
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Literal, Mapping, Optional
+
+
+class RateLimitRule(BaseModel):
+    """
+    Token bucket: requests_per_minute is the refill rate, burst the bucket size
+    (requests a client may send at once after being idle).
+    """
+    model_config = ConfigDict(frozen=True)
+
+    requests_per_minute: float = Field(gt=0)
+    burst: int = Field(ge=1)
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.requests_per_minute / 60
+
+    @property
+    def policy(self) -> str:
+        # RateLimit-Policy header value: the bucket size and the seconds an empty bucket needs to refill
+        return f"{self.burst};w={math.ceil(self.burst / self.tokens_per_second)}"
+
+
+class RateLimitConfig(BaseModel):
+    """
+    "rate_limits" section of the config file.
+    routes: route path template (as declared, e.g. ".../executions/{execution_id}") -> rule, routes not listed
+    use default.
+    backend: "local" keeps buckets per worker, so with N workers a client gets up to N times the rule.
+    "redis" shares them between workers and replicas. "auto" is redis when redis_url is set, else local.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    enabled: bool = True
+    default: RateLimitRule = RateLimitRule(requests_per_minute=120, burst=20)
+    routes: Mapping[str, RateLimitRule] = Field(default_factory=lambda: {
+        # Every call fans out into Vault and Harness requests
+        "/services/dataplatform/dsaas/create_project": RateLimitRule(requests_per_minute=10, burst=5),
+    })
+    backend: Literal["auto", "local", "redis"] = "auto"
+    redis_url: Optional[str] = None
+
+    @field_validator("routes")
+    @classmethod
+    def _freeze_routes(cls, value):
+        return MappingProxyType(dict(value))
+
+    def rule_for(self, path: str) -> RateLimitRule:
+        return self.routes.get(path, self.default)
@@ -1,12 +1,15 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Any, Optional,Literal
 
-class SuccessResponse(BaseModel):
+class BaseResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     status: str
     message: str
     data: Optional[Any] = None
-    
-class ErrorResponse(BaseModel):
-    status: str
-    message: str
-    data: Optional[Any] = None
\ No newline at end of file
+
+class SuccessResponse(BaseResponse):
+    status: Literal["1"] = "1"
+
+class ErrorResponse(BaseResponse):
+    status: Literal["0"] = "0"
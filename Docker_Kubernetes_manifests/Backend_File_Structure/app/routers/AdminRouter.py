@@ -0,0 +1,62 @@
+import os
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.exceptions import HTTPException
+from fastapi.responses import Response
+from typing import Optional
+from starlette.status import HTTP_200_OK, HTTP_403_FORBIDDEN, HTTP_409_CONFLICT, HTTP_422_UNPROCESSABLE_ENTITY
+from app.utils.LogUtils import logger
+from app.utils.ResponseUtils import success_response, error_response
+from app.utils.TimingUtils import histogram_report
+from app.utils.ProfilerUtils import PROFILE_FORMATS, PROFILE_MAX_SECONDS, ProfileBusyError, cprofile_profile, sample_profile
+from app.utils.CommonUtils import is_admin
+
+
+def require_admin(request: Request):
+    """ Allow members of the admin groups or tokens carrying the admin scope """
+    user = getattr(request.state, "user", None) or {}
+    if is_admin(user):
+        return user
+    logger.warning(f"Admin endpoint {request.url.path} refused for {user.get('sub')}")
+    raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail={"status": "0", "message": "Admin access required"})
+
+
+admin_router = APIRouter(prefix="/admin", tags=["Admin APIs"], dependencies=[Depends(require_admin)])
+
+
+@admin_router.get("/timings", status_code=HTTP_200_OK)
+def get_phase_timings():
+    """ Histograms of the request phases (jwt, jwks, payload, vault, harness, total) of this worker """
+    return success_response("Phase timings", {"worker_pid": os.getpid(), "phases": histogram_report()})
+
+
+@admin_router.post("/profile", status_code=HTTP_200_OK)
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=PROFILE_MAX_SECONDS),
+    mode: str = Query("sample", pattern="^(sample|cprofile)$"),
+    format: Optional[str] = Query(None, pattern="^(collapsed|pstats|text)$"),
+    interval_ms: float = Query(5, ge=1, le=1000),
+):
+    """
+    Profile the worker serving this request for the given seconds.
+    sample returns collapsed stacks for flame graphs (format=collapsed), cprofile a text report (format=text, the
+    default) or a pstats dump (format=pstats). Other mode and format combinations are rejected with 422.
+    """
+    format = format or PROFILE_FORMATS[mode][0]
+    if format not in PROFILE_FORMATS[mode]:
+        return error_response(f"mode={mode} supports format={'|'.join(PROFILE_FORMATS[mode])}", HTTP_422_UNPROCESSABLE_ENTITY)
+    worker_pid = os.getpid()
+    logger.warning(f"Profiling worker {worker_pid} for {seconds}s ({mode})")
+    try:
+        if mode == "sample":
+            body, media_type, extension = (await sample_profile(seconds, interval_ms)).encode("utf-8"), "text/plain", "collapsed"
+        elif format == "pstats":
+            body, media_type, extension = await cprofile_profile(seconds), "application/octet-stream", "pstats"
+        else:
+            body, media_type, extension = await cprofile_profile(seconds, as_text=True), "text/plain", "txt"
+    except ProfileBusyError as e:
+        return error_response(str(e), HTTP_409_CONFLICT)
+    headers = {
+        "Content-Disposition": f'attachment; filename="dsaas-{worker_pid}-{mode}.{extension}"',
+        "X-Profile-Worker": str(worker_pid),
+    }
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -1,12 +1,14 @@
-import yaml
 from datetime import datetime, timezone
 from fastapi import APIRouter,Request
-from fastapi.responses import JSONResponse
+from app.utils.ResponseUtils import success_response, error_response, detail_response, json_bytes_response, UNEXPECTED_ERROR_BODY
 from fastapi.exceptions import HTTPException
 from app.utils.LogUtils import logger
 from app.models import SuccessResponse, ErrorResponse,CrossAccountPayload
 from starlette.status import HTTP_200_OK,HTTP_201_CREATED,HTTP_400_BAD_REQUEST,HTTP_401_UNAUTHORIZED,HTTP_403_FORBIDDEN,HTTP_404_NOT_FOUND,HTTP_500_INTERNAL_SERVER_ERROR
-from app.utils.CommonUtils import fetch_api,generate_cross_account_payload,get_current_utc_datetime_str,config
+from app.utils.CommonUtils import fetch_api,generate_cross_account_payload,get_current_utc_datetime_str,is_admin
+from app.utils.getconfig import get_settings
+from app.utils.ExecutionTracker import execution_tracker
+from app.utils.TimingUtils import timed
 from app.utils import CommonUtilsConstants as CUC
 
 common_router = APIRouter(tags=["Common APIs"])
@@ -19,26 +21,41 @@ async def create_project(request: Request,payload: CrossAccountPayload):
         requestor_email_id = request.state.user["sub"]
         logger.info(f"Requestor Email ID : {requestor_email_id}")
         current_datetime = get_current_utc_datetime_str()
-        pipeline_id = config.get(CUC.CA_PIPELINE_ID)
+        pipeline_id = get_settings().cross_account_pipeline_id
         logger.info(f"Using Pipeline ID : {pipeline_id}")
-        json_input = generate_cross_account_payload(pipeline_id, payload, requestor_email_id,current_datetime)
+        with timed("payload"):
+            json_input = generate_cross_account_payload(pipeline_id, payload, requestor_email_id,current_datetime)
         response = await fetch_api(pipeline_id, json_input)
-        return JSONResponse(
-          status_code=201,
-          content={
-            "status":"1",
-            "message" : "Project Created Successfully",
-            "data":response
-          }
-        )
+        await track_execution(pipeline_id, response, requestor_email_id)
+        return success_response("Project Created Successfully", response, status_code=HTTP_201_CREATED)
     except HTTPException as ht:
-        return JSONResponse(
-            status_code=ht.status_code,
-            content= ht.detail
-        ) 
+        return detail_response(ht.detail, ht.status_code)
     except Exception as e:
         logger.info(e)
-        return JSONResponse(
-            status_code=500,
-            content= {"status":"0","message":"An unexpected error occurred. Please try again later."}
-        )
\ No newline at end of file
+        return json_bytes_response(UNEXPECTED_ERROR_BODY, HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+async def track_execution(pipeline_id, response, requestor_email_id):
+    """ Follow the started execution, a tracking failure never fails the project creation """
+    try:
+        plan_execution = response["data"]["planExecution"]
+        await execution_tracker.track(plan_execution["uuid"], pipeline_id, plan_execution.get("status"), requestor_email_id)
+    except Exception as e:
+        logger.warning(f"Harness execution not tracked: {e}")
+
+
+@common_router.get("/executions/{execution_id}", status_code=HTTP_200_OK)
+async def get_execution_status(request: Request, execution_id: str):
+    """
+    Status of a Harness execution started by /create_project, served from the cache, never from Harness.
+    Only the requestor and admins can read it, anyone else gets the same 404 as for an unknown execution.
+    """
+    try:
+        status = await execution_tracker.get_status(execution_id)
+        user = request.state.user
+        if status is None or (status.get("requestor") != user.get("sub") and not is_admin(user)):
+            return error_response("Execution not found", HTTP_404_NOT_FOUND)
+        return success_response("Execution Status Fetched Successfully", status)
+    except Exception as e:
+        logger.info(e)
+        return json_bytes_response(UNEXPECTED_ERROR_BODY, HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
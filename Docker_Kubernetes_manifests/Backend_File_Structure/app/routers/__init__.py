@@ -1 +1,2 @@
-from app.routers.CommonRouter import common_router
\ No newline at end of file
+from app.routers.CommonRouter import common_router
+from app.routers.AdminRouter import admin_router
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+Doc_Type            : Entrypoint
+Tech Description    : Runs the DSaaS backend with uvicorn, one worker per CPU available to the container.
+                      With more than one worker this process (the uvicorn supervisor) also owns the shared
+                      cache, so the JWKS key set, the Vault token and cached secrets are fetched once per pod
+                      instead of once per worker.
+Usage               : python -m app.serve [--host 0.0.0.0] [--port 8000] [--workers N]
+Worker count        : --workers, else DSAAS_WORKERS, else the container CPU limit (cgroup v2 cpu.max or
+                      v1 cfs quota/period, rounded up), else min(os.cpu_count(), DSAAS_MAX_WORKERS).
+"""
+import argparse
+import asyncio
+import math
+import os
+import tempfile
+import threading
+
+import uvicorn
+
+from app.utils import CommonUtilsConstants as CUC
+from app.utils.LogUtils import logger
+
+CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_CPU_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+CGROUP_V1_CPU_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+
+def _read(path: str):
+    try:
+        with open(path) as cgroup_file:
+            return cgroup_file.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit():
+    """ CPU limit of the container in cores, None when it is not limited """
+    cpu_max = _read(CGROUP_V2_CPU_MAX)
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+    quota, period = _read(CGROUP_V1_CPU_QUOTA), _read(CGROUP_V1_CPU_PERIOD)
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def worker_count() -> int:
+    configured = os.environ.get(CUC.WORKERS_ENV_VAR)
+    if configured:
+        return max(int(configured), 1)
+    limit = cgroup_cpu_limit()
+    if limit:
+        return max(math.ceil(limit), 1)
+    max_workers = int(os.environ.get(CUC.MAX_WORKERS_ENV_VAR, CUC.DEFAULT_MAX_WORKERS))
+    return max(min(os.cpu_count() or 1, max_workers), 1)
+
+
+def start_shared_cache() -> str:
+    """ Serve the shared cache from a daemon thread of the supervisor, returns the socket path """
+    # Imported here so the single worker path does not pay for it
+    from app.utils.SharedCache import SharedCacheServer
+
+    socket_path = os.path.join(tempfile.mkdtemp(prefix="dsaas-"), "shared-cache.sock")
+    server = SharedCacheServer(socket_path)
+    loop = asyncio.new_event_loop()
+    # Bind before any worker starts, then keep serving from the thread
+    loop.run_until_complete(server.start())
+    threading.Thread(target=loop.run_forever, name="shared-cache", daemon=True).start()
+    # Workers are spawned later and inherit the environment
+    os.environ[CUC.SHARED_CACHE_SOCKET_ENV_VAR] = socket_path
+    return socket_path
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.serve", description="Run the DSaaS backend")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, help=f"defaults to ${CUC.WORKERS_ENV_VAR} or the container CPU limit")
+    args = parser.parse_args()
+
+    workers = args.workers or worker_count()
+    # Workers inherit the environment, settings that depend on the worker count read it there
+    os.environ[CUC.WORKERS_ENV_VAR] = str(workers)
+    if workers > 1:
+        start_shared_cache()
+    logger.info(f"Starting DSaaS backend with {workers} worker(s) on {args.host}:{args.port}")
+    uvicorn.run("app.main:app", host=args.host, port=args.port, workers=workers)
+
+
+if __name__ == "__main__":
+    main()
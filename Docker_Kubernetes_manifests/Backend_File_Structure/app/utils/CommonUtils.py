@@ -1,52 +1,53 @@
-import requests,yaml,json,os,aiohttp,datetime
+import datetime
 from app.utils import CommonUtilsConstants
-from fastapi.responses import JSONResponse
 from fastapi.exceptions import HTTPException
-from app.utils.LogUtils import logger
+from app.utils.LogUtils import logger, request_id_headers
 import traceback
 from app.utils.VaultClient import vault_client
-from app.utils.getconfig import get_config
-
-
-    
-#Config Initialization
-config = get_config()
+from app.utils.getconfig import get_settings
+from app.utils.PayloadBuilder import build_pipeline_payload
+from app.models.PipelineModel import CROSS_ACCOUNT_PIPELINE
+from app.utils.HttpClient import http_client
+from app.utils.TimingUtils import timed
 
 
 #Function to Fetch Current Environment
 def get_current_environment():
     try:
         logger.info("Fetching current environment")
-        return config[CommonUtilsConstants.ENVIRONMENT_KEY]
+        return get_settings().environment
     except Exception as ex:
         raise Exception("ERROR::Unable to fetch current environment", str(ex))
 
 
-async def fetch_api(pipeline_id: str, payload: dict):
+async def fetch_api(pipeline_id: str, payload: bytes):
     """
     Asynchronously triggers a Harness pipeline using aiohttp.
 
     Args:
         pipeline_id (str): The pipeline ID to execute.
-        payload (dict | None): The request body payload (if any).
+        payload (bytes): The JSON encoded request body.
 
     Returns:
         dict: JSON response from the Harness API if successful.
     """
     try:
-        base_url = CommonUtilsConstants.HARNESS_BASE_URL
+        base_url = get_settings().harness_base_url
         api_url = base_url.replace(CommonUtilsConstants.PIPELINE_ID_KEY, pipeline_id)
         curr_env = get_current_environment()
         logger.info("Triggering Harness pipeline for environment: %s", curr_env)
-        secret = await vault_client.read_secret(CommonUtilsConstants.HARNESS_KEY_PATH, curr_env)
+        with timed("vault"):
+            secret = await vault_client.read_secret(CommonUtilsConstants.HARNESS_KEY_PATH, curr_env)
 
         headers = {
             "Content-Type": "application/json",
             "x-api-key": secret["x-api-key"],
+            **request_id_headers(),
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(api_url, headers=headers, json=payload) as response:
+        session = http_client.get_session()
+        with timed("harness"):
+            async with session.post(api_url, headers=headers, data=payload) as response:
                 response_text = await response.text()
 
                 if response.status == 200:
@@ -73,9 +74,9 @@ async def fetch_api(pipeline_id: str, payload: dict):
         raise
     except Exception:
         logger.error("Exception occurred while calling Harness API: %s", traceback.format_exc())
-        return JSONResponse(
+        raise HTTPException(
             status_code=500,
-            content={
+            detail={
                 "status": "0",
                 "message": "An unexpected error occurred. Please try again later."
             }
@@ -86,7 +87,7 @@ async def fetch_api(pipeline_id: str, payload: dict):
 def get_secret_engine(environment):
     try:
         logger.info("Fetching Vault Secret Engine")
-        secret_engine = config[CommonUtilsConstants.VAULT_SECRET_ENGINE].get(environment,"")
+        secret_engine = get_settings().vault_secret_engines.get(environment,"")
         if not secret_engine:
             raise Exception(f"Secret engine not found for environment: {environment}")
         return secret_engine
@@ -94,40 +95,22 @@ def get_secret_engine(environment):
         raise Exception("Unable to get secret engine", str(ex))
     
 def generate_cross_account_payload(pipeline_id, payload, requestor_email_id,current_datetime_str):
-    json_output = {
-    "pipeline": {
-        "identifier": "TestDJDSaaSCrossAccountDataSharing_Clone",
-        "variables": [
-            {"name": "apms_id", "type": "String", "value": f"{payload.project_details.apms_id}"},
-            {"name": "ci_id", "type": "String", "value": f"{payload.project_details.ci_id}"},
-            {"name": "vendor_name", "type": "String", "value": f"{payload.cross_account.source_details.vendor_name if payload.cross_account.source_details.vendor_name else payload.cross_account.target_details.vendor_name}"},
-            {"name": "business_unit", "type": "String", "value": f"{payload.project_details.business_unit}"},
-            {"name": "system_owner_email_id", "type": "String", "value": f"{requestor_email_id}"},
-            {"name": "business_owner_email_id", "type": "String", "value": f"{requestor_email_id}"},
-            {"name": "technical_owner_email_id", "type": "String", "value": f"{requestor_email_id}"},
-            {"name": "data_classification", "type": "String", "value": f"{payload.project_details.data_classification}"},
-            {"name": "source_s3_bucket_name", "type": "String", "value": f"{payload.cross_account.source_details.bucket}"},
-            {"name": "source_s3_location", "type": "String", "value": f"{payload.cross_account.source_details.path}"},
-            {"name": "source_file_format", "type": "String", "value": f"{payload.cross_account.source_details.file_format}"},
-            {"name": "source_kms_arn", "type": "String", "value": f"{payload.cross_account.source_details.kms_arn}"},
-            {"name": "target_s3_bucket_name", "type": "String", "value": f"{payload.cross_account.target_details.bucket}"},
-            {"name": "target_s3_location", "type": "String", "value": f"{payload.cross_account.target_details.path}"},
-            {"name": "target_kms_arn", "type": "String", "value": f"{payload.cross_account.target_details.kms_arn}"},
-            {"name": "transfer_type", "type": "String", "value": f"{payload.project_details.transfer_type}"},
-            {"name": "pipeline_frequency", "type": "String", "value": f"{payload.cross_account.pipeline.schedule_type if payload.cross_account.pipeline.schedule_type else payload.cross_account.pipeline.frequency}"},
-            {"name": "source_aws_region", "type": "String", "value": f"{payload.cross_account.source_details.region}"},
-            {"name": "target_aws_region", "type": "String", "value": f"{payload.cross_account.target_details.region}"},
-            {"name": "expired_after", "type": "String", "value": f"{payload.cross_account.pipeline.planned_end_date if payload.cross_account.pipeline.planned_end_date else ''}"},
-            {"name": "trigger_type", "type": "String", "value": "MANUAL"},
-            {"name": "scheduler_type", "type": "String", "value": ""},
-            {"name": "scheduler_time", "type": "String", "value": f"{payload.cross_account.pipeline.time if payload.cross_account.pipeline.time else current_datetime_str}"},
-            {"name": "is_active", "type": "String", "value": "Y"},
-            {"name": "cron_expression", "type": "String", "value": f"{payload.cross_account.pipeline.cron_expression if payload.cross_account.pipeline.cron_expression else ''}"}
-            ]
-        }
-    }
-    return json_output
+    """
+    Render the Harness execute body of the cross account pipeline as JSON bytes.
+    The variable mapping lives in the "pipelines" config section (see app.models.PipelineModel).
+    """
+    context = {"requestor_email_id": requestor_email_id, "current_datetime": current_datetime_str}
+    return build_pipeline_payload(CROSS_ACCOUNT_PIPELINE, pipeline_id, payload, context)
 
 def get_current_utc_datetime_str():
     utc_now = datetime.datetime.now(datetime.timezone.utc)
-    return utc_now.strftime("%Y-%m-%dT%H:%M:%S.000")
\ No newline at end of file
+    return utc_now.strftime("%Y-%m-%dT%H:%M:%S.000")
+
+def is_admin(user):
+    """ True for members of the admin groups ("groups" claim) or tokens carrying the admin scope ("scp" claim) """
+    user = user or {}
+    groups = user.get("groups") or []
+    scopes = user.get("scp") or []
+    if isinstance(scopes, str):
+        scopes = scopes.split()
+    return CommonUtilsConstants.ADMIN_SCOPE in scopes or any(group in get_settings().admin_groups for group in groups)
\ No newline at end of file
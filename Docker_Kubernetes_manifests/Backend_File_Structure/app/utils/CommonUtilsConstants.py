@@ -3,8 +3,17 @@ OKTA_DOMAIN = "https://takeda.okta.com"
 OKTA_AUDIENCE = "api://oneData"
 OKTA_ISSUER = f"{OKTA_DOMAIN}/oauth2/aus1lwtnqivqwTagO358"
 OKTA_JWKS_URL = f"{OKTA_ISSUER}/v1/keys"
+OKTA_JWKS_PATH = "/v1/keys"
+OKTA_CLIENT_ID = "0oa1i7c0qzmneJ54r358"
 
-CONFIG_FILE_PATH = "../config/dev/config.json"
+#Config file selection and hot reload
+CONFIG_FILE_PATH = "../config/{environment}/config.json"
+CONFIG_ENV_VAR = "ENVIRONMENT"
+CONFIG_PATH_ENV_VAR = "DSAAS_CONFIG_PATH"
+DEFAULT_CONFIG_ENVIRONMENT = "dev"
+CONFIG_ENVIRONMENT_ALIASES = {"prod": "prd", "test": "tst"}
+CONFIG_WATCH_INTERVAL_ENV_VAR = "DSAAS_CONFIG_WATCH_INTERVAL"
+CONFIG_WATCH_INTERVAL_SECONDS = 10
 URL_KEY = "URL_KEY"
 NAMESPACE_KEY = "NAMESPACE_KEY"
 ROLE_ID_KEY= "ROLE_ID_KEY"
@@ -18,4 +27,64 @@ ENVIRONMENT_KEY = "environment"
 HARNESS_BASE_URL = "https://app.harness.io/gateway/pipeline/api/pipeline/execute/PIPELINE_ID?accountIdentifier=etUzqvIyRSixpOWJqF4_Qg&orgIdentifier=GDDT&projectIdentifier=EDA"
 PIPELINE_ID_KEY = "PIPELINE_ID"
 HARNESS_KEY_PATH = "ODPE/harness"
-CA_PIPELINE_ID = "cross_account_pipeline_id"
\ No newline at end of file
+HARNESS_STATUS_URL = "https://app.harness.io/gateway/pipeline/api/pipelines/execution/v2/EXECUTION_ID?accountIdentifier=etUzqvIyRSixpOWJqF4_Qg&orgIdentifier=GDDT&projectIdentifier=EDA"
+EXECUTION_ID_KEY = "EXECUTION_ID"
+CA_PIPELINE_ID = "cross_account_pipeline_id"
+PIPELINES_KEY = "pipelines"
+
+#Multi worker serving and the shared cache owned by the supervisor (app.serve)
+WORKERS_ENV_VAR = "DSAAS_WORKERS"
+MAX_WORKERS_ENV_VAR = "DSAAS_MAX_WORKERS"
+DEFAULT_MAX_WORKERS = 4
+SHARED_CACHE_SOCKET_ENV_VAR = "DSAAS_SHARED_CACHE_SOCKET"
+SHARED_CACHE_LEASE_SECONDS = 10
+SHARED_CACHE_POLL_SECONDS = 0.05
+SHARED_CACHE_TIMEOUT_SECONDS = 2
+SHARED_CACHE_SWEEP_SECONDS = 60
+SHARED_CACHE_LOCAL_TTL_SECONDS = 5
+# A failed load answers callers of the same key with its error for this long instead of a new upstream call
+SHARED_CACHE_ERROR_TTL_SECONDS = 1
+JWKS_CACHE_KEY = "okta:jwks"
+JWKS_CACHE_TTL_SECONDS = 3600
+JWKS_MIN_REFRESH_SECONDS = 60
+VAULT_TOKEN_CACHE_KEY = "vault:token"
+VAULT_TOKEN_DEFAULT_TTL_SECONDS = 1800
+VAULT_TOKEN_TTL_MARGIN_SECONDS = 60
+VAULT_SECRET_CACHE_KEY = "vault:secret"
+VAULT_SECRET_CACHE_TTL_SECONDS = 300
+
+#Rate limiting in okta_auth_middleware, rules come from the "rate_limits" config section
+RATE_LIMITS_KEY = "rate_limits"
+RATE_LIMIT_MAX_BUCKETS = 100000
+RATE_LIMIT_EXPIRE_PER_CALL = 2
+RATE_LIMIT_REDIS_PREFIX = "dsaas:ratelimit"
+RATE_LIMIT_REDIS_TIMEOUT_SECONDS = 0.5
+# Bucket key of paths that match no route
+RATE_LIMIT_UNMATCHED_ROUTE = "unmatched"
+
+#Harness execution status tracking, statuses are compared upper case without underscores
+HARNESS_TERMINAL_STATUSES = frozenset({
+    "SUCCESS", "FAILED", "ABORTED", "EXPIRED", "ERRORED", "APPROVALREJECTED", "IGNOREFAILED", "ABORTEDBYFREEZE",
+})
+EXECUTION_CACHE_KEY = "harness:execution"
+# Poll soon after submission, then back off; the last interval repeats
+EXECUTION_POLL_INTERVALS_SECONDS = (5, 10, 20, 30, 60)
+EXECUTION_POLL_TICK_SECONDS = 1
+EXECUTION_POLL_BATCH_SIZE = 20
+EXECUTION_TRACK_MAX_SECONDS = 6 * 3600
+EXECUTION_TERMINAL_TTL_SECONDS = 24 * 3600
+
+#Admin endpoints (/admin/*) need one of these Okta groups ("groups" claim) or the admin scope ("scp" claim)
+ADMIN_GROUPS = ("DSaaS-Admins",)
+ADMIN_SCOPE = "dsaas.admin"
+
+#Cold start (app.utils.StartupUtils), read from the environment before the app and its config are loaded
+# Defer heavy imports and non critical warmups (Vault login) until the pod is serving. Set to 0 for eager startup
+LAZY_STARTUP_ENV_VAR = "DSAAS_LAZY_STARTUP"
+# Record import time per module during startup. Set to 0 to disable the import hook
+STARTUP_PROFILE_ENV_VAR = "DSAAS_STARTUP_PROFILE"
+# Delay before deferred warmups run, so the server has finished binding and passes readiness first
+STARTUP_WARMUP_DELAY_ENV_VAR = "DSAAS_STARTUP_WARMUP_DELAY"
+STARTUP_WARMUP_DELAY_SECONDS = 1
+# Number of slowest imports kept in the startup report
+STARTUP_REPORT_TOP_IMPORTS = 25
@@ -0,0 +1,129 @@
+"""
+Doc_Type            : Harness Execution Tracker
+Tech Description    : Follows the Harness executions started by /create_project until they reach a terminal state.
+                      Executions wait in a heap ordered by their next poll time. Every tick the worker polls at
+                      most EXECUTION_POLL_BATCH_SIZE due executions concurrently on the pooled session, so upstream
+                      calls per second are bounded however many users are watching. Intervals grow with each poll
+                      (EXECUTION_POLL_INTERVALS_SECONDS). The latest status of each execution is kept in the shared
+                      cache, where the status endpoint reads it; terminal states stay cached for a day.
+Ownership           : The worker that submitted an execution polls it. Other workers only read the shared cache.
+"""
+import asyncio
+import heapq
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.utils import CommonUtilsConstants as CUC
+from app.utils.CommonUtils import get_current_environment
+from app.utils.HttpClient import http_client
+from app.utils.LogUtils import logger
+from app.utils.SharedCache import shared_cache
+from app.utils.VaultClient import vault_client
+from app.utils.getconfig import get_settings
+
+
+def is_terminal(status: Optional[str]) -> bool:
+    return bool(status) and status.upper().replace("_", "") in CUC.HARNESS_TERMINAL_STATUSES
+
+
+def _cache_key(execution_id: str) -> str:
+    return f"{CUC.EXECUTION_CACHE_KEY}:{execution_id}"
+
+
+class ExecutionTracker:
+
+    def __init__(self):
+        # (next poll at, execution id), polls counted per execution for the back off
+        self._heap: List[Tuple[float, str]] = []
+        self._records: Dict[str, dict] = {}
+        self._polls: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def track(self, execution_id: str, pipeline_id: str, status: Optional[str], requestor: Optional[str]):
+        """ Register an execution returned by the Harness execute API """
+        now = time.time()
+        record = {
+            "execution_id": execution_id,
+            "pipeline_id": pipeline_id,
+            "status": status,
+            "terminal": is_terminal(status),
+            "requestor": requestor,
+            "submitted_at": now,
+            "updated_at": now,
+        }
+        await self._store(record)
+        if not record["terminal"]:
+            self._records[execution_id] = record
+            self._polls[execution_id] = 0
+            heapq.heappush(self._heap, (time.monotonic() + CUC.EXECUTION_POLL_INTERVALS_SECONDS[0], execution_id))
+
+    async def get_status(self, execution_id: str) -> Optional[dict]:
+        """ Last known status, None for executions that were not submitted through this service """
+        return await shared_cache.get(_cache_key(execution_id))
+
+    async def _store(self, record: dict):
+        ttl = CUC.EXECUTION_TERMINAL_TTL_SECONDS if record["terminal"] else CUC.EXECUTION_TRACK_MAX_SECONDS
+        await shared_cache.set(_cache_key(record["execution_id"]), record, ttl)
+
+    async def _fetch_status(self, execution_id: str, api_key: str) -> str:
+        url = get_settings().harness_status_url.replace(CUC.EXECUTION_ID_KEY, execution_id)
+        async with http_client.get_session().get(url, headers={"x-api-key": api_key}) as response:
+            if response.status != 200:
+                raise Exception(f"Harness status request failed: {response.status}")
+            body = await response.json()
+        return body["data"]["pipelineExecutionSummary"]["status"]
+
+    def _due(self) -> List[str]:
+        now = time.monotonic()
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < CUC.EXECUTION_POLL_BATCH_SIZE:
+            due.append(heapq.heappop(self._heap)[1])
+        return due
+
+    async def poll_due(self):
+        """ Poll one batch of due executions """
+        due = self._due()
+        if not due:
+            return
+        try:
+            secret = await vault_client.read_secret(CUC.HARNESS_KEY_PATH, get_current_environment())
+            results = await asyncio.gather(*(self._fetch_status(execution_id, secret["x-api-key"]) for execution_id in due),
+                                           return_exceptions=True)
+        except Exception as e:
+            results = [e] * len(due)
+        now = time.time()
+        for execution_id, result in zip(due, results):
+            record = self._records[execution_id]
+            if isinstance(result, Exception):
+                logger.warning(f"Status poll of Harness execution {execution_id} failed: {result}")
+            elif result != record["status"]:
+                record.update({"status": result, "terminal": is_terminal(result), "updated_at": now})
+                await self._store(record)
+                logger.info(f"Harness execution {execution_id} is {result}")
+            if record["terminal"] or now - record["submitted_at"] > CUC.EXECUTION_TRACK_MAX_SECONDS:
+                del self._records[execution_id], self._polls[execution_id]
+                continue
+            self._polls[execution_id] += 1
+            intervals = CUC.EXECUTION_POLL_INTERVALS_SECONDS
+            interval = intervals[min(self._polls[execution_id], len(intervals) - 1)]
+            heapq.heappush(self._heap, (time.monotonic() + interval, execution_id))
+
+    async def run(self):
+        while True:
+            try:
+                await self.poll_due()
+            except Exception:
+                logger.exception("Harness execution polling failed")
+            await asyncio.sleep(CUC.EXECUTION_POLL_TICK_SECONDS)
+
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+# Singleton instance
+execution_tracker = ExecutionTracker()
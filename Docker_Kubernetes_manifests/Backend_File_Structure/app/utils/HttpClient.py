@@ -0,0 +1,36 @@
+from __future__ import annotations
+from typing import Optional
+from app.utils.LogUtils import logger
+from app.utils.StartupUtils import lazy_import
+
+aiohttp = lazy_import("aiohttp")
+
+HTTP_TIMEOUT_SECONDS = 30
+HTTP_CONNECTION_LIMIT = 100
+
+
+class HttpClient:
+    """
+    One pooled aiohttp session per worker for outbound calls (Okta JWKS, Harness).
+    Connections are kept alive and reused instead of opening a new session per request.
+    """
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def get_session(self) -> aiohttp.ClientSession:
+        if not self._session or self._session.closed:
+            timeout = aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS)
+            connector = aiohttp.TCPConnector(limit=HTTP_CONNECTION_LIMIT)
+            self._session = aiohttp.ClientSession(timeout=timeout, connector=connector)
+            logger.info("Created shared aiohttp ClientSession")
+        return self._session
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            logger.info("Closing shared aiohttp ClientSession")
+            await self._session.close()
+
+
+# Singleton instance
+http_client = HttpClient()
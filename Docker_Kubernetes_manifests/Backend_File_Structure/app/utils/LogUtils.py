@@ -17,13 +17,21 @@ Config_file         : None
 """
 
 # Library and external modules declaration
+import contextvars
+import json
 import logging
 import os
 import sys
+import time
 
 from datetime import datetime
 from logging.handlers import RotatingFileHandler
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional, stdlib json is the fallback
+    orjson = None
+
 ## Module level constants which can be changed based on needs
 # Flag to enable console log handler. Can be True or False
 CONSOLE_HANDLER_ENABLED = True
@@ -38,6 +46,70 @@ FILE_HANDLER_LOG_NAME = "DLPLogSetup.log"
 FILE_HANDLER_MAX_FILE_SIZE = 10 * 1024 * 1024
 # Default log formatter. Made similar to Airflow log formatter
 LOG_FORMATTER_KEY = "[%(asctime)s] {%(filename)s:%(lineno)s} %(levelname)-5.5s - %(message)s"
+# Log line format. "json" emits one JSON object per line for Filebeat/Logstash, "text" uses LOG_FORMATTER_KEY
+LOG_FORMAT = os.environ.get("DSAAS_LOG_FORMAT", "json").lower()
+# Key order of every JSON log line. Built once so each record is serialized in the same order
+JSON_LOG_KEYS = ("timestamp", "level", "logger", "file", "line", "request_id", "message")
+# Header used to receive and propagate the request correlation id
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Correlation id of the request being served in the current context
+request_id_var = contextvars.ContextVar("request_id", default=None)
+
+
+def get_request_id():
+    """
+    Purpose   :   Fetch the correlation id of the request being served in the current context
+    Input     :   None
+    Output    :   Request id string or None outside of a request
+    """
+    return request_id_var.get()
+
+
+def request_id_headers():
+    """
+    Purpose   :   Build the outbound header carrying the current request id (Harness, Vault, ...)
+    Input     :   None
+    Output    :   Dict with the request id header, empty outside of a request
+    """
+    request_id = request_id_var.get()
+    return {REQUEST_ID_HEADER: request_id} if request_id else {}
+
+
+class JsonLogFormatter(logging.Formatter):
+    """
+    Purpose   :   Format log records as single line JSON objects with a fixed key order (JSON_LOG_KEYS).
+                  Uses orjson when it is installed and caches the per-second timestamp prefix
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._cached_second = None
+        self._cached_prefix = ""
+
+    def _timestamp(self, created):
+        second = int(created)
+        if second != self._cached_second:
+            self._cached_second = second
+            self._cached_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return "%s.%03dZ" % (self._cached_prefix, (created - second) * 1000)
+
+    def format(self, record):
+        values = (
+            self._timestamp(record.created),
+            record.levelname,
+            record.name,
+            record.filename,
+            record.lineno,
+            request_id_var.get(),
+            record.getMessage(),
+        )
+        log_entry = dict(zip(JSON_LOG_KEYS, values))
+        if record.exc_info:
+            log_entry["exception"] = self.formatException(record.exc_info)
+        if orjson is not None:
+            return orjson.dumps(log_entry, default=str).decode("utf-8")
+        return json.dumps(log_entry, separators=(",", ":"), default=str)
 
 
 def set_log_level(logger_object, log_level):
@@ -77,7 +149,10 @@ def get_logger(log_level=None, enable_console_log=CONSOLE_HANDLER_ENABLED, enabl
 
     # Check whether the logger object has any existing handlers
     if not root_logger.handlers:
-        log_formatter = logging.Formatter(LOG_FORMATTER_KEY)
+        if LOG_FORMAT == "json":
+            log_formatter = JsonLogFormatter()
+        else:
+            log_formatter = logging.Formatter(LOG_FORMATTER_KEY)
 
         # Add console handler
         if enable_console_log:
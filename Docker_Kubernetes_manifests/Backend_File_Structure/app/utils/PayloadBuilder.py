@@ -0,0 +1,95 @@
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+from app.models.PipelineModel import PipelineTemplate, PipelineVariable
+from app.utils.LogUtils import logger
+from app.utils.ResponseUtils import encode_json
+from app.utils.getconfig import config_store, get_settings
+
+
+def _tuple_getter(paths: List[str]) -> Callable[[Any], tuple]:
+    """ attrgetter returning a tuple for any number of paths """
+    if not paths:
+        return lambda payload: ()
+    if len(paths) == 1:
+        get_attribute = attrgetter(paths[0])
+        return lambda payload: (get_attribute(payload),)
+    return attrgetter(*paths)
+
+
+def _sources(variable: PipelineVariable) -> Tuple[str, ...]:
+    if variable.value is not None:
+        return ()
+    return (variable.source,) if isinstance(variable.source, str) else tuple(variable.source)
+
+
+class CompiledPayloadTemplate:
+    """
+    Harness execute body compiled from a PipelineTemplate.
+    All payload attribute paths of the template are read with one attrgetter call, context keys
+    are looked up once, and every variable is reduced to its constant or to the positions of its
+    sources among those values. Rendering builds the body dict and encodes it in one call
+    (orjson when installed).
+    """
+    __slots__ = ("_get_attributes", "_context_keys", "_variables")
+
+    def __init__(self, template: PipelineTemplate):
+        sources_of = [_sources(variable) for variable in template.variables]
+        all_sources = [source for sources in sources_of for source in sources]
+        paths = list(dict.fromkeys(source for source in all_sources if not source.startswith("$")))
+        context_keys = list(dict.fromkeys(source[1:] for source in all_sources if source.startswith("$")))
+        # Context values follow the payload values
+        positions = {source: index for index, source in enumerate(paths + [f"${key}" for key in context_keys])}
+        self._get_attributes = _tuple_getter(paths)
+        self._context_keys = tuple(context_keys)
+        self._variables = tuple(
+            (variable.name, variable.type, variable.value, tuple(positions[source] for source in sources),
+             variable.default)
+            for variable, sources in zip(template.variables, sources_of)
+        )
+
+    def render(self, pipeline_id: str, payload, context: Mapping[str, Any]) -> bytes:
+        values = self._get_attributes(payload) + tuple(map(context.get, self._context_keys))
+        variables = []
+        for name, type_, value, positions, default in self._variables:
+            if value is None:
+                # First non empty source wins, matching "a if a else b" in the original payload builder
+                value = default
+                for position in positions:
+                    candidate = values[position]
+                    if candidate:
+                        value = candidate if candidate.__class__ is str else str(candidate)
+                        break
+            variables.append({"name": name, "type": type_, "value": value})
+        return encode_json({"pipeline": {"identifier": pipeline_id, "variables": variables}})
+
+
+_compiled_templates: Dict[str, CompiledPayloadTemplate] = {}
+
+
+def compile_payload_templates(settings=None) -> Dict[str, CompiledPayloadTemplate]:
+    """ Compile every pipeline template of the given (or current) config snapshot """
+    global _compiled_templates
+    settings = settings or get_settings()
+    _compiled_templates = {
+        pipeline_type: CompiledPayloadTemplate(template)
+        for pipeline_type, template in settings.pipelines.items()
+    }
+    logger.info(f"Compiled Harness payload templates: {sorted(_compiled_templates)}")
+    return _compiled_templates
+
+
+def _on_config_change(old, new):
+    if old.pipelines != new.pipelines:
+        compile_payload_templates(new)
+
+
+config_store.subscribe(_on_config_change)
+
+
+def build_pipeline_payload(pipeline_type: str, pipeline_id: str, payload, context: Mapping[str, Any]) -> bytes:
+    """ Render the Harness execute body for a pipeline type as JSON bytes """
+    templates = _compiled_templates or compile_payload_templates()
+    template = templates.get(pipeline_type)
+    if template is None:
+        raise Exception(f"No payload template configured for pipeline type: {pipeline_type}")
+    return template.render(pipeline_id, payload, context)
@@ -0,0 +1,116 @@
+"""
+Doc_Type            : Profiler Utility
+Tech Description    : Time boxed profiles of the live worker for the admin profile endpoint. Everything the worker
+                      does runs on its event loop thread, so both modes profile that thread while the endpoint
+                      itself just sleeps for the requested duration.
+Modes               : sample    a stdlib sampler thread reads the loop thread's stack every interval and counts
+                                collapsed stacks ("module:function;module:function count"), the input format of
+                                flamegraph.pl and speedscope. Overhead is low enough for production pods.
+                      cprofile  deterministic cProfile of the loop thread, returned as a pstats dump (binary, open
+                                with pstats/snakeviz) or as text sorted by cumulative time. Slows the worker down
+                                noticeably while it runs.
+"""
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import tempfile
+import threading
+from collections import Counter
+
+PROFILE_MAX_SECONDS = 60
+PROFILE_DEFAULT_SAMPLE_INTERVAL_MS = 5
+PROFILE_MAX_STACK_DEPTH = 128
+# Output formats each mode can produce, the first one is the default
+PROFILE_FORMATS = {"sample": ("collapsed",), "cprofile": ("text", "pstats")}
+
+# One profile per worker at a time, two samplers would only measure each other
+_profile_lock = threading.Lock()
+
+
+class ProfileBusyError(Exception):
+    pass
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", os.path.basename(code.co_filename))
+    return f"{module}:{code.co_name}"
+
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None and len(names) < PROFILE_MAX_STACK_DEPTH:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler(threading.Thread):
+    """ Samples the stack of one thread at a fixed interval until stopped """
+
+    def __init__(self, target_thread_id: int, interval_seconds: float):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.target_thread_id = target_thread_id
+        self.interval_seconds = interval_seconds
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.target_thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+                self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _acquire():
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfileBusyError("A profile is already running on this worker")
+
+
+async def sample_profile(seconds: float, interval_ms: float = PROFILE_DEFAULT_SAMPLE_INTERVAL_MS) -> str:
+    """ Collapsed stacks of the event loop thread over the next seconds """
+    _acquire()
+    try:
+        sampler = StackSampler(threading.get_ident(), interval_ms / 1000)
+        sampler.start()
+        try:
+            await asyncio.sleep(min(seconds, PROFILE_MAX_SECONDS))
+        finally:
+            sampler.stop()
+        return sampler.collapsed()
+    finally:
+        _profile_lock.release()
+
+
+async def cprofile_profile(seconds: float, as_text: bool = False) -> bytes:
+    """ cProfile of the event loop thread over the next seconds, a pstats dump or a text report """
+    _acquire()
+    try:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await asyncio.sleep(min(seconds, PROFILE_MAX_SECONDS))
+        finally:
+            profiler.disable()
+        if as_text:
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(100)
+            return report.getvalue().encode("utf-8")
+        # pstats only dumps to files
+        with tempfile.NamedTemporaryFile(suffix=".pstats") as dump:
+            profiler.dump_stats(dump.name)
+            return dump.read()
+    finally:
+        _profile_lock.release()
@@ -0,0 +1,245 @@
+"""
+Doc_Type            : Rate Limiter
+Tech Description    : Token bucket rate limiting per client and route, used by okta_auth_middleware after the
+                      token is verified. Routes are keyed by their path template (/executions/{execution_id}), so
+                      changing a path parameter never yields a fresh bucket. Each bucket is (tokens, updated_at) and is refilled lazily on access,
+                      so a request costs O(1) regardless of traffic. Buckets idle long enough to be full again
+                      are dropped, since a full bucket is the same as no bucket.
+Backends            : LocalRateLimiter keeps buckets in the worker, so with N uvicorn workers (app.serve) a client
+                      may get up to N times the configured rate.
+                      RedisRateLimiter runs the same algorithm in one Lua script so limits hold across workers
+                      and replicas. It needs the optional "redis" package and falls back to the local buckets
+                      (fail open) when Redis is unreachable. backend "auto" (the default) uses Redis whenever
+                      rate_limits.redis_url is set.
+Headers             : RateLimit-Limit, RateLimit-Remaining, RateLimit-Reset and RateLimit-Policy on every limited
+                      response, plus Retry-After on 429.
+"""
+import math
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from starlette.requests import Request
+from starlette.routing import Match
+
+from app.models.RateLimitModel import RateLimitConfig, RateLimitRule
+from app.utils import CommonUtilsConstants as CUC
+from app.utils.getconfig import config_store, get_settings
+from app.utils.LogUtils import logger
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - redis is only needed for the shared backend
+    redis_asyncio = None
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    rule: RateLimitRule
+    remaining: int
+    # Seconds until the bucket is full again, and until the next request is allowed
+    reset_seconds: float
+    retry_after_seconds: float
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.rule.burst),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_seconds)),
+            "RateLimit-Policy": self.rule.policy,
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(math.ceil(self.retry_after_seconds), 1))
+        return headers
+
+
+def _decide(tokens: float, rule: RateLimitRule) -> RateLimitDecision:
+    """ Decision for a bucket holding tokens after the refill, before this request is taken out """
+    rate = rule.tokens_per_second
+    allowed = tokens >= 1
+    if allowed:
+        tokens -= 1
+    return RateLimitDecision(
+        allowed=allowed,
+        rule=rule,
+        remaining=int(tokens),
+        reset_seconds=(rule.burst - tokens) / rate,
+        retry_after_seconds=0.0 if allowed else (1 - tokens) / rate,
+    )
+
+
+class LocalRateLimiter:
+    """
+    Buckets of this worker, least recently used first. Expired buckets are only looked for at the
+    front of the order, which keeps cleanup O(1) amortized per request.
+    """
+
+    def __init__(self, max_buckets: int = CUC.RATE_LIMIT_MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        # key -> [tokens, updated_at, full_at]
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    def _expire(self, now: float):
+        buckets = self._buckets
+        for _ in range(CUC.RATE_LIMIT_EXPIRE_PER_CALL):
+            if not buckets:
+                return
+            key, bucket = next(iter(buckets.items()))
+            if bucket[2] > now and len(buckets) <= self.max_buckets:
+                return
+            del buckets[key]
+
+    def acquire_now(self, key: str, rule: RateLimitRule) -> RateLimitDecision:
+        now = time.monotonic()
+        self._expire(now)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = float(rule.burst)
+        else:
+            self._buckets.move_to_end(key)
+            tokens = min(rule.burst, bucket[0] + (now - bucket[1]) * rule.tokens_per_second)
+        decision = _decide(tokens, rule)
+        remaining = tokens - 1 if decision.allowed else tokens
+        self._buckets[key] = [remaining, now, now + decision.reset_seconds]
+        return decision
+
+    async def acquire(self, key: str, rule: RateLimitRule) -> RateLimitDecision:
+        return self.acquire_now(key, rule)
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+# KEYS[1] bucket, ARGV: burst, tokens per second. Returns {allowed, tokens after the request as a string}
+# Redis TIME is the clock, so replicas with skewed clocks still agree
+TOKEN_BUCKET_SCRIPT = """
+local burst = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = burst
+if bucket[1] then
+    tokens = math.min(burst, tonumber(bucket[1]) + (now - tonumber(bucket[2])) * rate)
+end
+local allowed = 0
+if tokens >= 1 then
+    allowed = 1
+    tokens = tokens - 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((burst - tokens) / rate * 1000) + 1000)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimiter:
+    """ Buckets in Redis, shared by every worker and replica. Expiry is left to Redis key TTLs """
+
+    def __init__(self, redis_url: str):
+        self._client = redis_asyncio.from_url(redis_url, socket_timeout=CUC.RATE_LIMIT_REDIS_TIMEOUT_SECONDS)
+        self._script = self._client.register_script(TOKEN_BUCKET_SCRIPT)
+        self._fallback = LocalRateLimiter()
+
+    async def acquire(self, key: str, rule: RateLimitRule) -> RateLimitDecision:
+        try:
+            allowed, tokens = await self._script(
+                keys=[f"{CUC.RATE_LIMIT_REDIS_PREFIX}:{key}"], args=[rule.burst, rule.tokens_per_second]
+            )
+        except Exception as e:
+            logger.warning(f"Rate limit backend unavailable, using local buckets: {e}")
+            return self._fallback.acquire_now(key, rule)
+        tokens = float(tokens)
+        # The script already took the token out, rebuild the decision from what is left
+        return _decide(tokens + 1, rule) if allowed else _decide(tokens, rule)
+
+    async def close(self):
+        await self._client.aclose()
+
+
+def create_rate_limiter(config: RateLimitConfig):
+    if config.backend == "redis" or (config.backend == "auto" and config.redis_url):
+        if redis_asyncio is None or not config.redis_url:
+            logger.error("Redis rate limit backend needs the redis package and rate_limits.redis_url, using local buckets")
+        else:
+            logger.info("Using the Redis rate limit backend")
+            return RedisRateLimiter(config.redis_url)
+    workers = int(os.environ.get(CUC.WORKERS_ENV_VAR) or 1)
+    if workers > 1:
+        logger.warning(f"Local rate limit buckets with {workers} workers: clients may get up to {workers} times the "
+                       f"configured limits, set rate_limits.redis_url to share them")
+    return LocalRateLimiter()
+
+
+_lazy_router_warned = False
+
+
+def _warn_lazy_router(route):
+    global _lazy_router_warned
+    if not _lazy_router_warned:
+        _lazy_router_warned = True
+        logger.error(f"Rate limit buckets fall back to raw paths, {type(route).__name__} exposes no path template. "
+                     f"Keep fastapi pinned as in requirements.txt")
+
+
+def route_template(request: Request) -> str:
+    """
+    Path template of the route that will serve the request. Middleware runs before routing, so the
+    route is matched here; unknown paths share one key instead of creating a bucket per path.
+    """
+    partial = None
+    for route in request.app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.NONE:
+            continue
+        template = getattr(route, "path", None)
+        if template is None:
+            # Routers included lazily (FastAPI releases newer than the pinned 0.109) only match their routes
+            # while handling the request, so every path parameter value would get its own bucket
+            _warn_lazy_router(route)
+            return request.url.path
+        if match == Match.FULL:
+            return template
+        if partial is None:
+            partial = template
+    return partial or CUC.RATE_LIMIT_UNMATCHED_ROUTE
+
+
+class RateLimiter:
+    """ Applies the configured rules; the backend is rebuilt when the backend settings change """
+
+    def __init__(self):
+        self._backend = None
+        self._backend_key: Optional[tuple] = None
+
+    def _get_backend(self, config: RateLimitConfig):
+        backend_key = (config.backend, config.redis_url)
+        if self._backend is None or backend_key != self._backend_key:
+            self._backend, self._backend_key = create_rate_limiter(config), backend_key
+        return self._backend
+
+    async def check(self, client_id: str, route: str) -> Optional[RateLimitDecision]:
+        """ Take one token for this client and route template, None when rate limiting is disabled """
+        config = get_settings().rate_limits
+        if not config.enabled:
+            return None
+        rule = config.rule_for(route)
+        return await self._get_backend(config).acquire(f"{client_id}:{route}", rule)
+
+    def _on_config_change(self, old, new):
+        # Buckets sized for the old rules are dropped, clients start again with a full bucket
+        if old.rate_limits != new.rate_limits and isinstance(self._backend, LocalRateLimiter):
+            self._backend = None
+            logger.info("Rate limits changed, local buckets reset")
+
+    async def close(self):
+        if isinstance(self._backend, RedisRateLimiter):
+            await self._backend.close()
+
+
+# Singleton instance
+rate_limiter = RateLimiter()
+config_store.subscribe(rate_limiter._on_config_change)
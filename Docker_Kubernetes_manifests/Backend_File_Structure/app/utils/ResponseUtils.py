@@ -0,0 +1,62 @@
+import json
+from typing import Any, Optional
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+from app.models import SuccessResponse, ErrorResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional, stdlib json is the fallback
+    orjson = None
+
+JSON_MEDIA_TYPE = "application/json"
+
+# Built once, each call reuses the compiled validator/serializer
+_success_adapter = TypeAdapter(SuccessResponse)
+_error_adapter = TypeAdapter(ErrorResponse)
+
+
+def encode_json(value) -> bytes:
+    """ Compact JSON bytes, orjson when installed """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """ JSONResponse rendered with orjson, used as the app's default response class """
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
+
+
+def success_body(message: str, data: Optional[Any] = None) -> bytes:
+    response = _success_adapter.validate_python({"message": message, "data": data})
+    return _success_adapter.dump_json(response)
+
+
+def error_body(message: str) -> bytes:
+    response = _error_adapter.validate_python({"message": message})
+    return _error_adapter.dump_json(response, exclude_none=True)
+
+
+def json_bytes_response(body: bytes, status_code: int = 200) -> Response:
+    """ Response around an already encoded body, no serialization on the request path """
+    return Response(content=body, status_code=status_code, media_type=JSON_MEDIA_TYPE)
+
+
+def success_response(message: str, data: Optional[Any] = None, status_code: int = 200) -> Response:
+    return json_bytes_response(success_body(message, data), status_code)
+
+
+def error_response(message: str, status_code: int = 500) -> Response:
+    return json_bytes_response(error_body(message), status_code)
+
+
+def detail_response(detail: Any, status_code: int) -> Response:
+    """ Response for an HTTPException detail, normally {"status": "0", "message": ...} """
+    return json_bytes_response(encode_json(detail), status_code)
+
+
+# Pre-encoded constant bodies
+UNEXPECTED_ERROR_BODY = error_body("An unexpected error occurred. Please try again later.")
@@ -0,0 +1,241 @@
+"""
+Doc_Type            : Shared Cache
+Tech Description    : Small key/value cache with TTLs shared by all uvicorn workers of a pod. The supervisor
+                      (app.serve) owns the data and serves it on a unix socket; workers talk to it with
+                      SharedCacheClient. Without a socket (single process mode) LocalCache offers the same
+                      interface in process. get_or_load() adds single flight loading through leases, so N
+                      workers missing the same key cause one upstream call (JWKS fetch, Vault login, secret read).
+                      A failed load is kept on the lease key for SHARED_CACHE_ERROR_TTL_SECONDS: waiting and new
+                      callers raise SharedCacheLoadError with the same message instead of all calling the upstream.
+Protocol            : One JSON object per line in each direction.
+                      {"op": "get", "key": k}                      -> {"value": v | null}
+                      {"op": "set", "key": k, "value": v, "ttl": s} -> {"ok": true}
+                      {"op": "delete", "key": k}                    -> {"ok": true}
+                      {"op": "lease", "key": k, "ttl": s}           -> {"acquired": bool}
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.utils import CommonUtilsConstants as CUC
+from app.utils.LogUtils import logger
+
+
+class SharedCacheLoadError(Exception):
+    """ The lease holder's load of a key failed, raised to the callers that waited for it """
+    pass
+
+
+class LocalCache:
+    """ In process TTL cache, also the storage behind SharedCacheServer """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+
+    def _get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    def _set(self, key: str, value, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+
+    def _delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def _lease(self, key: str, ttl: float) -> bool:
+        if self._get(key) is not None:
+            return False
+        self._set(key, True, ttl)
+        return True
+
+    def sweep(self):
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in self._entries.items() if expires_at < now]:
+            del self._entries[key]
+
+    async def get(self, key: str):
+        return self._get(key)
+
+    async def get_uncached(self, key: str):
+        """ Current value, never a worker local copy (lease state) """
+        return self._get(key)
+
+    async def set(self, key: str, value, ttl: float):
+        self._set(key, value, ttl)
+
+    async def delete(self, key: str):
+        self._delete(key)
+
+    async def lease(self, key: str, ttl: float) -> bool:
+        return self._lease(key, ttl)
+
+    async def get_or_load(self, key: str, ttl, loader: Callable[[], Awaitable[Any]]):
+        """
+        Cached value for key, or load it once across all processes sharing the cache.
+        ttl is seconds, or a function of the loaded value (for example a Vault lease duration).
+        The lease holder loads and stores the value; others wait for it up to the lease TTL and then
+        load it themselves, so a crashed or slow lease holder never blocks requests for long.
+        If the holder's load fails, the error replaces the lease for a short time and everyone waiting
+        or arriving meanwhile gets SharedCacheLoadError right away.
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+        lease_key = f"{key}:lease"
+        if await self.lease(lease_key, CUC.SHARED_CACHE_LEASE_SECONDS):
+            failed = False
+            try:
+                value = await loader()
+                await self.set(key, value, ttl(value) if callable(ttl) else ttl)
+                return value
+            except Exception as e:
+                failed = True
+                await self.set(lease_key, {"error": str(e) or type(e).__name__}, CUC.SHARED_CACHE_ERROR_TTL_SECONDS)
+                raise
+            finally:
+                if not failed:
+                    await self.delete(lease_key)
+        deadline = time.monotonic() + CUC.SHARED_CACHE_LEASE_SECONDS
+        while True:
+            # The holder stores the value before releasing the lease, so read the lease first
+            lease = await self.get_uncached(lease_key)
+            if isinstance(lease, dict):
+                raise SharedCacheLoadError(lease["error"])
+            value = await self.get(key)
+            if value is not None:
+                return value
+            if lease is None or time.monotonic() >= deadline:
+                # Released without a value, or the holder is stuck
+                return await loader()
+            await asyncio.sleep(CUC.SHARED_CACHE_POLL_SECONDS)
+
+
+class SharedCacheServer:
+    """ Serves a LocalCache on a unix socket, run by the supervisor process """
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self.cache = LocalCache()
+        self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        cache = self.cache
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = json.loads(line)
+                op, key = request["op"], request["key"]
+                if op == "get":
+                    response = {"value": cache._get(key)}
+                elif op == "set":
+                    cache._set(key, request["value"], request["ttl"])
+                    response = {"ok": True}
+                elif op == "delete":
+                    cache._delete(key)
+                    response = {"ok": True}
+                elif op == "lease":
+                    response = {"acquired": cache._lease(key, request["ttl"])}
+                else:
+                    response = {"error": f"unknown op {op}"}
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError, KeyError) as e:
+            logger.warning(f"Shared cache connection closed: {e}")
+        finally:
+            writer.close()
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(CUC.SHARED_CACHE_SWEEP_SECONDS)
+            self.cache.sweep()
+
+    async def start(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        # Secrets and tokens live here, only the pod user may connect
+        os.chmod(self.socket_path, 0o600)
+        asyncio.get_running_loop().create_task(self._sweep())
+        logger.info(f"Shared cache listening on {self.socket_path}")
+
+
+class SharedCacheClient(LocalCache):
+    """
+    Worker side of the shared cache. One persistent connection per worker, requests are serialized on it.
+    If the supervisor cannot be reached every call degrades to a cache miss, so requests still go to the upstream.
+    """
+
+    def __init__(self, socket_path: str):
+        super().__init__()
+        self.socket_path = socket_path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _call(self, request: dict) -> Optional[dict]:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._writer is None or self._writer.is_closing():
+                        self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+                    self._writer.write(json.dumps(request).encode("utf-8") + b"\n")
+                    await self._writer.drain()
+                    line = await asyncio.wait_for(self._reader.readline(), CUC.SHARED_CACHE_TIMEOUT_SECONDS)
+                    if line:
+                        return json.loads(line)
+                except (OSError, asyncio.TimeoutError, ValueError) as e:
+                    logger.warning(f"Shared cache unavailable ({e}), attempt {attempt + 1}")
+                if self._writer is not None:
+                    self._writer.close()
+                self._writer = None
+            return None
+
+    # Hits are also kept in process for a few seconds, so hot keys do not cost a socket round trip per request
+    async def get(self, key: str):
+        value = self._get(key)
+        if value is not None:
+            return value
+        response = await self._call({"op": "get", "key": key})
+        value = response.get("value") if response else None
+        if value is not None:
+            self._set(key, value, CUC.SHARED_CACHE_LOCAL_TTL_SECONDS)
+        return value
+
+    async def get_uncached(self, key: str):
+        response = await self._call({"op": "get", "key": key})
+        return response.get("value") if response else None
+
+    async def set(self, key: str, value, ttl: float):
+        self._set(key, value, min(ttl, CUC.SHARED_CACHE_LOCAL_TTL_SECONDS))
+        await self._call({"op": "set", "key": key, "value": value, "ttl": ttl})
+
+    async def delete(self, key: str):
+        self._delete(key)
+        await self._call({"op": "delete", "key": key})
+
+    async def lease(self, key: str, ttl: float) -> bool:
+        response = await self._call({"op": "lease", "key": key, "ttl": ttl})
+        # Without the supervisor every worker loads for itself
+        return response.get("acquired", True) if response else True
+
+
+def _create_shared_cache() -> LocalCache:
+    socket_path = os.environ.get(CUC.SHARED_CACHE_SOCKET_ENV_VAR)
+    if socket_path:
+        return SharedCacheClient(socket_path)
+    return LocalCache()
+
+
+shared_cache = _create_shared_cache()
@@ -0,0 +1,133 @@
+"""
+Doc_Type            : Startup Utility
+Tech Description    : Cold start helpers. lazy_import() defers loading heavy third party modules until first use
+                      (or until the post-readiness warmup), and startup_profiler records import time per module and
+                      the duration of each lifespan phase so cold start regressions show up in the startup report.
+                      Only the standard library and CommonUtilsConstants (its environment variable names) are
+                      imported here because this module is imported before the app.
+Example             : startup_profiler.install()            # first statement of app.main
+                      jwt = lazy_import("jwt")              # module level, loads on first attribute access
+                      with startup_profiler.phase("lifespan.vault_auth"): ...
+"""
+import builtins
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from app.utils import CommonUtilsConstants as CUC
+
+LAZY_STARTUP_ENABLED = os.environ.get(CUC.LAZY_STARTUP_ENV_VAR, "1") == "1"
+STARTUP_PROFILE_ENABLED = os.environ.get(CUC.STARTUP_PROFILE_ENV_VAR, "1") == "1"
+STARTUP_WARMUP_DELAY_SECONDS = float(os.environ.get(CUC.STARTUP_WARMUP_DELAY_ENV_VAR, CUC.STARTUP_WARMUP_DELAY_SECONDS))
+
+# Modules loaded through lazy_import(), forced in by load_deferred_modules()
+_deferred_modules = []
+
+
+def lazy_import(name):
+    """
+    Purpose   :   Import a module lazily in lazy startup mode (the module body runs on first attribute access),
+                  or eagerly otherwise
+    Input     :   Absolute module name
+    Output    :   Module object
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    if not LAZY_STARTUP_ENABLED:
+        return importlib.import_module(name)
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    _deferred_modules.append(module)
+    return module
+
+
+def load_deferred_modules():
+    """
+    Purpose   :   Force every lazily imported module to load so the first request does not pay for it
+    Input     :   None
+    Output    :   None
+    """
+    for module in _deferred_modules:
+        # Any attribute access runs the deferred module body
+        getattr(module, "__name__")
+
+
+class StartupProfiler:
+    """
+    Purpose   :   Collect per module import times (inclusive and self) and named startup phase durations
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self._original_import = None
+        self._import_stack = []
+        self._imports = {}
+        self._phases = []
+        self.ready_after = None
+
+    def install(self):
+        if not STARTUP_PROFILE_ENABLED or self._original_import is not None:
+            return
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def uninstall(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Only the first, absolute import of a module is timed, cached imports go straight through
+        if level != 0 or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        self._import_stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._import_stack.pop()
+            if self._import_stack:
+                self._import_stack[-1] += elapsed
+            self._imports[name] = (elapsed, elapsed - children)
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases.append((name, time.perf_counter() - start))
+
+    def mark_ready(self):
+        self.ready_after = time.perf_counter() - self.started_at
+        self.uninstall()
+
+    def report(self):
+        slowest = sorted(self._imports.items(), key=lambda item: item[1][1], reverse=True)[:CUC.STARTUP_REPORT_TOP_IMPORTS]
+        return {
+            "lazy_startup": LAZY_STARTUP_ENABLED,
+            "ready_after_ms": round(self.ready_after * 1000, 2) if self.ready_after is not None else None,
+            "total_import_ms": round(sum(own for _, own in self._imports.values()) * 1000, 2),
+            "imports": [
+                {"module": name, "inclusive_ms": round(total * 1000, 2), "self_ms": round(own * 1000, 2)}
+                for name, (total, own) in slowest
+            ],
+            "phases": [{"phase": name, "duration_ms": round(duration * 1000, 2)} for name, duration in self._phases],
+        }
+
+    def log_report(self):
+        logging.getLogger().info(f"Startup report: {json.dumps(self.report())}")
+
+
+startup_profiler = StartupProfiler()
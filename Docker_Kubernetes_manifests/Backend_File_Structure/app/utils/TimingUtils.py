@@ -0,0 +1,107 @@
+"""
+Doc_Type            : Timing Utility
+Tech Description    : Phase timers for the request path. timed("phase") records the duration of a block in the
+                      current request (reported in the Server-Timing response header by timing_middleware) and in
+                      a per worker histogram of that phase (GET /admin/timings).
+Phases              : jwt (verify_jwt, includes jwks), jwks (JWKS from the shared cache or Okta), payload (Harness
+                      body rendering), vault (read_secret), harness (Harness execute call), total (whole request)
+Example             : with timed("vault"):
+                          secret = await vault_client.read_secret(path, environment)
+"""
+import bisect
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+# Upper bounds of the histogram buckets in milliseconds, the last bucket is unbounded
+HISTOGRAM_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+SERVER_TIMING_HEADER = "Server-Timing"
+
+# (phase, milliseconds) recorded during the current request, None outside of requests
+request_timings_var: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+class Histogram:
+    """ Fixed bucket latency histogram, O(log buckets) per observation """
+
+    def __init__(self):
+        self.counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float):
+        self.counts[bisect.bisect_left(HISTOGRAM_BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def quantile(self, q: float) -> float:
+        """ Upper bound of the bucket holding the q quantile, never above the largest observation """
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(HISTOGRAM_BUCKETS_MS[index], self.max_ms) if index < len(HISTOGRAM_BUCKETS_MS) else self.max_ms
+        return 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            # Prometheus style cumulative buckets
+            "buckets": dict(zip([str(bound) for bound in HISTOGRAM_BUCKETS_MS] + ["+Inf"],
+                                _cumulative(self.counts))),
+        }
+
+
+def _cumulative(counts: List[int]) -> List[int]:
+    total, result = 0, []
+    for count in counts:
+        total += count
+        result.append(total)
+    return result
+
+
+phase_histograms: Dict[str, Histogram] = {}
+
+
+def record_phase(phase: str, duration_ms: float):
+    histogram = phase_histograms.get(phase)
+    if histogram is None:
+        histogram = phase_histograms[phase] = Histogram()
+    histogram.observe(duration_ms)
+    timings = request_timings_var.get()
+    if timings is not None:
+        timings.append((phase, duration_ms))
+
+
+@contextmanager
+def timed(phase: str):
+    """ Time the block as phase, failures included """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(phase, (time.perf_counter() - started) * 1000)
+
+
+def server_timing(timings: List[Tuple[str, float]]) -> str:
+    """ Server-Timing header value, a phase that ran more than once is reported with its summed duration """
+    totals: Dict[str, float] = {}
+    for phase, duration_ms in timings:
+        totals[phase] = totals.get(phase, 0.0) + duration_ms
+    return ", ".join(f"{phase};dur={duration_ms:.2f}" for phase, duration_ms in totals.items())
+
+
+def histogram_report() -> dict:
+    return {phase: histogram.snapshot() for phase, histogram in sorted(phase_histograms.items())}
@@ -1,24 +1,52 @@
+from __future__ import annotations
 import asyncio
-import aiohttp
+import hashlib
 from typing import Optional
 from app.utils import CommonUtils,CommonUtilsConstants as CUC
-from app.utils.LogUtils import logger
-from app.utils.getconfig import get_config
+from app.utils.LogUtils import logger, request_id_headers
+from app.utils.getconfig import config_store, get_settings
+from app.utils.StartupUtils import lazy_import
+from app.utils.SharedCache import shared_cache
+
+aiohttp = lazy_import("aiohttp")
 
-#get current config
-config = get_config()
 
 class VaultClient:
     def __init__(self):
-        self.base_url = f"{config.get(CUC.URL_KEY)}v1"
-        self.namespace = config.get(CUC.NAMESPACE_KEY,"")
-        self.role_id = config.get(CUC.ROLE_ID_KEY,"")
-        self.secret_id = config.get(CUC.SECRET_ID_KEY,"")
         self._token: Optional[str] = None
         self._lock = asyncio.Lock()  # Prevent concurrent auth calls
         self._session: Optional[aiohttp.ClientSession] = None        
+        self._identity_hash: Optional[str] = None
+        config_store.subscribe(self._on_config_change)
         logger.info("VaultClient initialized")
 
+    # Connection details are read from the current config snapshot so reloads apply without a restart
+    @property
+    def base_url(self) -> str:
+        return f"{get_settings().vault_url}v1"
+
+    @property
+    def namespace(self) -> str:
+        return get_settings().vault_namespace
+
+    @property
+    def role_id(self) -> str:
+        return get_settings().vault_role_id
+
+    @property
+    def secret_id(self) -> str:
+        return get_settings().vault_secret_id
+
+    def _on_config_change(self, old, new):
+        """
+        Drop the cached token when the Vault endpoint or AppRole changed, the next read re-authenticates.
+        """
+        self._identity_hash = None
+        if (old.vault_url, old.vault_namespace, old.vault_role_id, old.vault_secret_id) != \
+                (new.vault_url, new.vault_namespace, new.vault_role_id, new.vault_secret_id):
+            self._token = None
+            logger.info("Vault settings changed, token invalidated")
+
 
     async def _get_session(self) -> aiohttp.ClientSession:
         if not self._session or self._session.closed:
@@ -28,29 +56,59 @@ class VaultClient:
             logger.info("Created new aiohttp ClientSession for VaultClient")
         return self._session
 
+    def _identity(self) -> str:
+        # Endpoint and AppRole credentials, so a config change or a rotated secret_id never hands out a token or
+        # secret obtained with the old ones. Only this one way hash of the secret_id ends up in cache keys
+        if self._identity_hash is None:
+            identity = f"{self.base_url}|{self.namespace}|{self.role_id}|{self.secret_id}".encode("utf-8")
+            self._identity_hash = hashlib.sha256(identity).hexdigest()[:16]
+        return self._identity_hash
+
+    def _token_cache_key(self) -> str:
+        return f"{CUC.VAULT_TOKEN_CACHE_KEY}:{self._identity()}"
+
+    async def _login(self) -> dict:
+        session = await self._get_session()
+        url = f"{self.base_url}/auth/approle/login"
+        headers = {"X-Vault-Namespace": self.namespace, **request_id_headers()}
+        payload = {"role_id": self.role_id, "secret_id": self.secret_id}
+
+        async with session.post(url, json=payload, headers=headers) as resp:
+            if resp.status != 200:
+                body = await resp.text()
+                raise Exception(f"Vault authentication failed: {resp.status} - {body}")
+            data = await resp.json()
+            logger.info("Vault authentication successful")
+            lease_duration = data["auth"].get("lease_duration") or CUC.VAULT_TOKEN_DEFAULT_TTL_SECONDS
+            return {
+                "token": data["auth"]["client_token"],
+                "ttl": max(lease_duration - CUC.VAULT_TOKEN_TTL_MARGIN_SECONDS, 1),
+            }
+
     async def _authenticate(self):
         """
         Authenticate with Vault using AppRole.
-        Uses a lock to prevent multiple concurrent auth requests.
+        Uses a lock to prevent multiple concurrent auth requests in this worker, and the shared
+        cache so that one login serves every worker of the pod.
         """
         async with self._lock:
             # Another coroutine might have already refreshed the token
             if self._token:
                 return self._token
 
-            session = await self._get_session()
-            url = f"{self.base_url}/auth/approle/login"
-            headers = {"X-Vault-Namespace": self.namespace}
-            payload = {"role_id": self.role_id, "secret_id": self.secret_id}
-
-            async with session.post(url, json=payload, headers=headers) as resp:
-                if resp.status != 200:
-                    body = await resp.text()
-                    raise Exception(f"Vault authentication failed: {resp.status} - {body}")
-                data = await resp.json()
-                self._token = data["auth"]["client_token"]
-                logger.info("Vault authentication successful")
-                return self._token
+            login = await shared_cache.get_or_load(self._token_cache_key(), lambda value: value["ttl"], self._login)
+            self._token = login["token"]
+            return self._token
+
+    async def _invalidate_token(self, stale_token: str):
+        """
+        Forget a rejected token. The shared copy is only dropped if no other worker has replaced it yet.
+        """
+        self._token = None
+        key = self._token_cache_key()
+        cached = await shared_cache.get(key)
+        if cached and cached["token"] == stale_token:
+            await shared_cache.delete(key)
 
     async def _ensure_token(self):
         """
@@ -61,26 +119,37 @@ class VaultClient:
             logger.info("Vault token ensured")
 
     async def read_secret(self, path: str, environment: str):
+        """
+        Read secret from Vault KV v2, cached for all workers for VAULT_SECRET_CACHE_TTL_SECONDS.
+        """
+        mount_point = CommonUtils.get_secret_engine(environment)
+        key = f"{CUC.VAULT_SECRET_CACHE_KEY}:{self._identity()}:{mount_point}:{path}"
+        return await shared_cache.get_or_load(
+            key, CUC.VAULT_SECRET_CACHE_TTL_SECONDS, lambda: self._read_secret(mount_point, path)
+        )
+
+    async def _read_secret(self, mount_point: str, path: str, retried: bool = False):
         """
         Read secret from Vault KV v2 with concurrency safety.
         """
         await self._ensure_token()
         session = await self._get_session()
-        mount_point = CommonUtils.get_secret_engine(environment)
+        token = self._token
         url = f"{self.base_url}/{mount_point}/data/{path}"
         headers = {
-            "X-Vault-Token": self._token,
+            "X-Vault-Token": token,
             "X-Vault-Namespace": self.namespace,
+            **request_id_headers(),
         }
 
         async with session.get(url, headers=headers) as resp:
-            if resp.status == 403:
+            if resp.status == 403 and not retried:
                 # Token might be expired — reauthenticate once
-                self._token = None
                 logger.info("Vault token expired, reauthenticating")
+                await self._invalidate_token(token)
                 await self._authenticate()
                 logger.info("Reauthentication successful, retrying secret read")
-                return await self.read_secret(path, environment)
+                return await self._read_secret(mount_point, path, retried=True)
             elif resp.status != 200:
                 body = await resp.text()
                 raise Exception(f"Failed to read secret: {resp.status} - {body}")
@@ -1,16 +1,150 @@
-import os,json
+import os,json,asyncio
+from types import MappingProxyType
+from typing import Callable, List, Literal, Mapping, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
 from app.utils import CommonUtilsConstants
+from app.models.PipelineModel import PipelineTemplate, DEFAULT_PIPELINE_TEMPLATES
+from app.models.RateLimitModel import RateLimitConfig
 from app.utils.LogUtils import logger
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-CONFIG_FILE_PATH = os.path.join(CURRENT_DIR, CommonUtilsConstants.CONFIG_FILE_PATH)
-
-#Config File Loader
-def get_config():
-    try:
-        logger.info("Fetching Configs")
-        with open(CONFIG_FILE_PATH) as config_file:
-            config = json.load(config_file)
-            return config
-    except Exception as e:
-        raise Exception("ERROR::Unable to fetch configs", str(e))
\ No newline at end of file
+
+
+def resolve_config_path():
+    """
+    Select the config file from the environment.
+    DSAAS_CONFIG_PATH wins (mounted ConfigMap), otherwise ENVIRONMENT picks config/<env>/config.json
+    """
+    explicit_path = os.environ.get(CommonUtilsConstants.CONFIG_PATH_ENV_VAR)
+    if explicit_path:
+        return explicit_path
+    environment = os.environ.get(CommonUtilsConstants.CONFIG_ENV_VAR, CommonUtilsConstants.DEFAULT_CONFIG_ENVIRONMENT).lower()
+    environment = CommonUtilsConstants.CONFIG_ENVIRONMENT_ALIASES.get(environment, environment)
+    return os.path.join(CURRENT_DIR, CommonUtilsConstants.CONFIG_FILE_PATH.format(environment=environment))
+
+
+class Settings(BaseModel):
+    """ Validated, immutable snapshot of the service config file """
+    model_config = ConfigDict(frozen=True, populate_by_name=True, extra="ignore")
+
+    environment: Literal["dev", "tst", "prd"] = Field(alias=CommonUtilsConstants.ENVIRONMENT_KEY)
+    vault_url: str = Field(alias=CommonUtilsConstants.URL_KEY)
+    vault_namespace: str = Field("", alias=CommonUtilsConstants.NAMESPACE_KEY)
+    vault_role_id: str = Field(alias=CommonUtilsConstants.ROLE_ID_KEY)
+    vault_secret_id: str = Field(alias=CommonUtilsConstants.SECRET_ID_KEY)
+    vault_secret_engines: Mapping[str, str] = Field(alias=CommonUtilsConstants.VAULT_SECRET_ENGINE)
+    cross_account_pipeline_id: str = Field(alias=CommonUtilsConstants.CA_PIPELINE_ID)
+    # Upstream endpoints, overridable per environment (and pointed at local stubs by the load test suite)
+    okta_issuer: str = Field(CommonUtilsConstants.OKTA_ISSUER, alias="OKTA_ISSUER")
+    okta_audience: str = Field(CommonUtilsConstants.OKTA_AUDIENCE, alias="OKTA_AUDIENCE")
+    okta_client_id: str = Field(CommonUtilsConstants.OKTA_CLIENT_ID, alias="OKTA_CLIENT_ID")
+    harness_base_url: str = Field(CommonUtilsConstants.HARNESS_BASE_URL, alias="HARNESS_BASE_URL")
+    harness_status_url: str = Field(CommonUtilsConstants.HARNESS_STATUS_URL, alias="HARNESS_STATUS_URL")
+    admin_groups: Tuple[str, ...] = Field(CommonUtilsConstants.ADMIN_GROUPS, alias="ADMIN_GROUPS")
+    # Harness variable mapping per pipeline type, see app.models.PipelineModel
+    pipelines: Mapping[str, PipelineTemplate] = Field(default_factory=lambda: dict(DEFAULT_PIPELINE_TEMPLATES),
+                                                      alias=CommonUtilsConstants.PIPELINES_KEY, validate_default=True)
+    # Token bucket limits per client and route, see app.models.RateLimitModel
+    rate_limits: RateLimitConfig = Field(default_factory=RateLimitConfig, alias=CommonUtilsConstants.RATE_LIMITS_KEY)
+
+    @field_validator("vault_url")
+    @classmethod
+    def _normalise_vault_url(cls, value):
+        # VaultClient appends "v1" to the base url
+        return value.rstrip("/") + "/"
+
+    @property
+    def okta_jwks_url(self) -> str:
+        return f"{self.okta_issuer}{CommonUtilsConstants.OKTA_JWKS_PATH}"
+
+    @field_validator("pipelines", mode="before")
+    @classmethod
+    def _merge_default_pipelines(cls, value):
+        # Config entries add pipeline types or override the built in ones
+        return {**DEFAULT_PIPELINE_TEMPLATES, **(value or {})}
+
+    @field_validator("vault_secret_engines", "pipelines")
+    @classmethod
+    def _freeze_mapping(cls, value):
+        return MappingProxyType(dict(value))
+
+
+class ConfigStore:
+    """
+    Loads the config file once and hands out immutable Settings snapshots.
+    The file is polled by mtime (ConfigMap updates swap the mounted file) and a
+    new snapshot is swapped in atomically; listeners get (old, new) on change.
+    An invalid file is logged and the previous snapshot stays active.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._settings: Optional[Settings] = None
+        self._file_stamp: Optional[Tuple[int, int, int]] = None
+        self._listeners: List[Callable[[Settings, Settings], None]] = []
+
+    @property
+    def settings(self) -> Settings:
+        if self._settings is None:
+            self.load()
+        return self._settings
+
+    def _stat(self):
+        stat = os.stat(self.path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def load(self) -> Settings:
+        try:
+            logger.info(f"Loading config from {self.path}")
+            file_stamp = self._stat()
+            with open(self.path) as config_file:
+                settings = Settings.model_validate(json.load(config_file))
+        except (OSError, ValueError, ValidationError) as e:
+            raise Exception("ERROR::Unable to fetch configs", str(e))
+        previous, self._settings, self._file_stamp = self._settings, settings, file_stamp
+        if previous is not None and previous != settings:
+            for listener in self._listeners:
+                try:
+                    listener(previous, settings)
+                except Exception:
+                    logger.exception("Config reload listener failed")
+        return settings
+
+    def reload_if_changed(self) -> bool:
+        try:
+            file_stamp = self._stat()
+        except OSError as e:
+            logger.error(f"Config file not readable, keeping previous config: {e}")
+            return False
+        if file_stamp == self._file_stamp:
+            return False
+        try:
+            self.load()
+            logger.info("Config reloaded")
+            return True
+        except Exception as e:
+            # Remember the broken file so it is reported once, not on every poll
+            self._file_stamp = file_stamp
+            logger.error(f"Config reload failed, keeping previous config: {e}")
+            return False
+
+    def subscribe(self, listener: Callable[[Settings, Settings], None]):
+        self._listeners.append(listener)
+
+    async def watch(self, interval: float):
+        """ Poll the config file until cancelled """
+        while True:
+            await asyncio.sleep(interval)
+            self.reload_if_changed()
+
+
+config_store = ConfigStore(resolve_config_path())
+
+
+def get_settings() -> Settings:
+    """ Current config snapshot. Call per use instead of caching it, so reloads are picked up """
+    return config_store.settings
+
+
+def get_watch_interval() -> float:
+    return float(os.environ.get(CommonUtilsConstants.CONFIG_WATCH_INTERVAL_ENV_VAR, CommonUtilsConstants.CONFIG_WATCH_INTERVAL_SECONDS))
@@ -0,0 +1,143 @@
+"""
+Micro-benchmarks of the /create_project request/response overhead (no network).
+
+Stages:
+  validate_request   CrossAccountPayload from the raw JSON body
+  build_payload      Harness execute body bytes: the former hand written dict builder (stdlib json, orjson) vs
+                     the compiled template
+  render_response    201 body around a Harness execute response, stdlib JSONResponse vs the shared response layer
+  render_health      /health body, stdlib JSONResponse vs the pre-encoded constant
+
+Usage (from Backend_File_Structure):
+    python -m benchmarks.bench_create_project [--number 20000] [--json]
+"""
+import argparse
+import json
+import timeit
+
+from fastapi.responses import JSONResponse
+
+from app.models import CrossAccountPayload
+from app.utils.CommonUtils import generate_cross_account_payload
+from app.utils.ResponseUtils import encode_json, json_bytes_response, success_body, success_response
+
+REQUEST_BODY = json.dumps({
+    "project_details": {
+        "apms_id": "12345", "ci_id": "CI0098765", "business_unit": "R&D", "data_classification": "Confidential",
+        "environment": "dev", "data_sharing_type": "cross_account", "transfer_type": "push",
+    },
+    "cross_account": {
+        "source_details": {"bucket": "src-bucket", "path": "landing/in/", "file_format": "parquet",
+                           "kms_arn": "arn:aws:kms:us-east-1:111111111111:key/abcd", "region": "us-east-1",
+                           "vendor_name": "acme"},
+        "target_details": {"bucket": "tgt-bucket", "path": "raw/acme/",
+                           "kms_arn": "arn:aws:kms:us-east-1:222222222222:key/efgh", "region": "us-east-1"},
+        "pipeline": {"frequency": "daily", "schedule_type": "cron", "cron_expression": "0 2 * * *"},
+        "acknowledgement": True,
+    },
+}).encode("utf-8")
+
+HARNESS_RESPONSE = {
+    "status": "SUCCESS",
+    "data": {"planExecution": {"uuid": "Qa1b2c3d4e5f6g7h8i9j0", "status": "RUNNING", "startTs": 1700000000000,
+                               "metadata": {"runSequence": 42, "triggerInfo": {"triggerType": "MANUAL"}}}},
+    "metaData": None,
+    "correlationId": "0f1e2d3c-4b5a-6978-8796-a5b4c3d2e1f0",
+}
+
+HEALTH_BODY = success_body("DSaaS Backend is healthy", {})
+
+
+def dict_builder_payload(payload, requestor_email_id, current_datetime_str):
+    """ The hand written builder the compiled templates replaced, as a baseline """
+    project, source = payload.project_details, payload.cross_account.source_details
+    target, pipeline = payload.cross_account.target_details, payload.cross_account.pipeline
+    values = (
+        ("apms_id", f"{project.apms_id}"),
+        ("ci_id", f"{project.ci_id}"),
+        ("vendor_name", f"{source.vendor_name if source.vendor_name else target.vendor_name}"),
+        ("business_unit", f"{project.business_unit}"),
+        ("system_owner_email_id", f"{requestor_email_id}"),
+        ("business_owner_email_id", f"{requestor_email_id}"),
+        ("technical_owner_email_id", f"{requestor_email_id}"),
+        ("data_classification", f"{project.data_classification}"),
+        ("source_s3_bucket_name", f"{source.bucket}"),
+        ("source_s3_location", f"{source.path}"),
+        ("source_file_format", f"{source.file_format}"),
+        ("source_kms_arn", f"{source.kms_arn}"),
+        ("target_s3_bucket_name", f"{target.bucket}"),
+        ("target_s3_location", f"{target.path}"),
+        ("target_kms_arn", f"{target.kms_arn}"),
+        ("transfer_type", f"{project.transfer_type}"),
+        ("pipeline_frequency", f"{pipeline.schedule_type if pipeline.schedule_type else pipeline.frequency}"),
+        ("source_aws_region", f"{source.region}"),
+        ("target_aws_region", f"{target.region}"),
+        ("expired_after", f"{pipeline.planned_end_date if pipeline.planned_end_date else ''}"),
+        ("trigger_type", "MANUAL"),
+        ("scheduler_type", ""),
+        ("scheduler_time", f"{pipeline.time if pipeline.time else current_datetime_str}"),
+        ("is_active", "Y"),
+        ("cron_expression", f"{pipeline.cron_expression if pipeline.cron_expression else ''}"),
+    )
+    return {"pipeline": {"identifier": "TestDJDSaaSCrossAccountDataSharing_Clone",
+                         "variables": [{"name": name, "type": "String", "value": value} for name, value in values]}}
+
+
+def stdlib_created_response():
+    return JSONResponse(status_code=201, content={"status": "1", "message": "Project Created Successfully",
+                                                 "data": HARNESS_RESPONSE})
+
+
+def stdlib_health_response():
+    return JSONResponse(status_code=200, content={"status": "1", "message": "DSaaS Backend is healthy", "data": {}})
+
+
+def run(number):
+    payload = CrossAccountPayload.model_validate_json(REQUEST_BODY)
+    cases = {
+        "validate_request": {
+            "stdlib json + model": lambda: CrossAccountPayload(**json.loads(REQUEST_BODY)),
+            "model_validate_json": lambda: CrossAccountPayload.model_validate_json(REQUEST_BODY),
+        },
+        "build_payload": {
+            "dict + stdlib json": lambda: json.dumps(dict_builder_payload(
+                payload, "user@example.com", "2024-01-01T00:00:00.000")).encode("utf-8"),
+            "dict + encode_json": lambda: encode_json(dict_builder_payload(
+                payload, "user@example.com", "2024-01-01T00:00:00.000")),
+            "compiled template": lambda: generate_cross_account_payload(
+                "TestDJDSaaSCrossAccountDataSharing_Clone", payload, "user@example.com", "2024-01-01T00:00:00.000"),
+        },
+        "render_response": {
+            "stdlib JSONResponse": stdlib_created_response,
+            "success_response": lambda: success_response("Project Created Successfully", HARNESS_RESPONSE, 201),
+        },
+        "render_health": {
+            "stdlib JSONResponse": stdlib_health_response,
+            "pre-encoded body": lambda: json_bytes_response(HEALTH_BODY),
+        },
+    }
+    results = []
+    for stage, variants in cases.items():
+        for variant, func in variants.items():
+            best = min(timeit.repeat(func, number=number, repeat=5))
+            results.append({"stage": stage, "variant": variant, "us_per_call": round(best / number * 1e6, 3)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20000, help="calls per timing run (best of 5 runs)")
+    parser.add_argument("--json", action="store_true", help="print machine readable results")
+    args = parser.parse_args()
+
+    results = run(args.number)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'stage':<18} {'variant':<22} {'us/call':>9}")
+    for result in results:
+        print(f"{result['stage']:<18} {result['variant']:<22} {result['us_per_call']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
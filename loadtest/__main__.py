@@ -0,0 +1,198 @@
+"""
+Load test and benchmark suite for the DSaaS backend and the data collection service.
+
+  python -m loadtest stubs                         run the Okta/Vault/Harness stubs until interrupted
+  python -m loadtest run --scenario ... [...]      run scenarios, print and save results
+  python -m loadtest compare BASELINE CURRENT      compare two result files, exit 1 on regression
+
+Run from the repository root. See loadtest/README.md for examples.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+import aiohttp
+
+from loadtest import baseline
+from loadtest.runner import ResourceSampler, run_fixed_rps
+from loadtest.scenarios import SCENARIOS, ScenarioContext
+from loadtest.stubs import StubBehaviour, StubServers
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DSAAS_DIR = os.path.join(REPO_ROOT, "Docker_Kubernetes_manifests", "Backend_File_Structure")
+JOBS_DIR = os.path.join(REPO_ROOT, "Devops_Engineer_assignment", "app")
+DSAAS_PORT = 18000
+JOBS_PORT = 18001
+
+
+def _stub_servers(args) -> StubServers:
+    return StubServers(
+        okta=StubBehaviour(args.okta_latency_ms, args.jitter_ms, args.okta_error_rate),
+        vault=StubBehaviour(args.vault_latency_ms, args.jitter_ms, args.vault_error_rate),
+        harness=StubBehaviour(args.harness_latency_ms, args.jitter_ms, args.harness_error_rate),
+    )
+
+
+def _launch(cmd, cwd, env) -> subprocess.Popen:
+    return subprocess.Popen(cmd, cwd=cwd, env={**os.environ, **env}, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+async def _wait_ready(url: str, timeout_s: float = 30.0):
+    deadline = time.monotonic() + timeout_s
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout_s}s")
+
+
+def _stop(process: subprocess.Popen):
+    if process and process.poll() is None:
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+
+
+async def _start_service(service: str, args, config_path: str) -> subprocess.Popen:
+    """Launch a fresh DSaaS backend or data collection service and wait until it is healthy"""
+    if service == "dsaas":
+        cmd = [sys.executable, "-m", "app.serve", "--host", "127.0.0.1", "--port", str(DSAAS_PORT),
+               "--workers", str(args.dsaas_workers)]
+        process = _launch(cmd, DSAAS_DIR, {"DSAAS_CONFIG_PATH": config_path, "DSAAS_LOG_FORMAT": "json"})
+        url = f"http://127.0.0.1:{DSAAS_PORT}"
+    else:
+        cmd = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(JOBS_PORT),
+               "--no-access-log"]
+        process = _launch(cmd, JOBS_DIR, {"LOG_LEVEL": "WARNING"})
+        url = f"http://127.0.0.1:{JOBS_PORT}"
+    try:
+        await _wait_ready(f"{url}/health")
+    except Exception:
+        _stop(process)
+        raise
+    return process
+
+
+async def run(args) -> int:
+    stubs = _stub_servers(args)
+    await stubs.start()
+    process = None
+    config_file = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+    json.dump(stubs.dsaas_config(), config_file)
+    config_file.close()
+    try:
+        dsaas_url = args.dsaas_url or f"http://127.0.0.1:{DSAAS_PORT}"
+        jobs_url = args.jobs_url or f"http://127.0.0.1:{JOBS_PORT}"
+        external = {"dsaas": bool(args.dsaas_url), "jobs": bool(args.jobs_url)}
+        ctx = ScenarioContext(stubs=stubs, dsaas_url=dsaas_url, jobs_url=jobs_url)
+        results = baseline.new_results()
+        for name in args.scenario:
+            service, setup = SCENARIOS[name]
+            # Every scenario gets a fresh service, so background work of earlier scenarios (execution status
+            # polling, running jobs) neither shows up in its upstream counts nor competes for its CPU
+            if not external[service]:
+                process = await _start_service(service, args, config_file.name)
+            async with aiohttp.ClientSession() as session:
+                request = await setup(ctx, session)
+            pid = args.pid or (process.pid if process else None)
+            sampler = ResourceSampler(pid) if pid else None
+            stubs.counters.requests.clear()
+            if sampler:
+                sampler.start()
+            outcome = await run_fixed_rps(name, request, args.rps, args.duration)
+            summary = outcome.summary()
+            summary["resources"] = await sampler.stop() if sampler else {}
+            summary["upstream_requests"] = dict(sorted(stubs.counters.requests.items()))
+            _stop(process)
+            process = None
+            results["scenarios"][name] = summary
+            latency = summary["latency_ms"]
+            print(f"{name}: {summary['requests']} req, {summary['throughput_rps']} rps, "
+                  f"p50 {latency['p50']}ms p95 {latency['p95']}ms p99 {latency['p99']}ms, "
+                  f"errors {summary['errors']}, upstream {summary['upstream_requests']}")
+        if args.out:
+            baseline.save(results, args.out)
+            print(f"results written to {args.out}")
+        return 0
+    finally:
+        _stop(process)
+        await stubs.stop()
+        os.unlink(config_file.name)
+
+
+async def serve_stubs(args) -> int:
+    stubs = _stub_servers(args)
+    await stubs.start()
+    print(json.dumps({"dsaas_config": stubs.dsaas_config(), "token": stubs.minter.mint()}, indent=2))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stubs.stop()
+    return 0
+
+
+def compare(args) -> int:
+    lines = baseline.compare(baseline.load(args.baseline), baseline.load(args.current), args.threshold)
+    print("\n".join(lines))
+    return 1 if any(line.startswith(("REGRESSION", "MISSING")) for line in lines) else 0
+
+
+def _add_stub_arguments(parser):
+    parser.add_argument("--okta-latency-ms", type=float, default=0.0)
+    parser.add_argument("--vault-latency-ms", type=float, default=0.0)
+    parser.add_argument("--harness-latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra latency added by every stub")
+    parser.add_argument("--okta-error-rate", type=float, default=0.0)
+    parser.add_argument("--vault-error-rate", type=float, default=0.0)
+    parser.add_argument("--harness-error-rate", type=float, default=0.0)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    stubs_parser = commands.add_parser("stubs", help="run the upstream stubs only")
+    _add_stub_arguments(stubs_parser)
+
+    run_parser = commands.add_parser("run", help="run load scenarios")
+    run_parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), required=True)
+    run_parser.add_argument("--rps", type=float, default=20.0)
+    run_parser.add_argument("--duration", type=float, default=30.0, help="seconds per scenario")
+    run_parser.add_argument("--dsaas-url", help="use a running DSaaS backend instead of launching one")
+    run_parser.add_argument("--jobs-url", help="use a running data collection service instead of launching one")
+    run_parser.add_argument("--dsaas-workers", type=int, default=1, help="uvicorn workers of the launched DSaaS backend")
+    run_parser.add_argument("--pid", type=int, help="server pid to sample CPU/RSS for (workers included)")
+    run_parser.add_argument("--out", help="write results in the baseline format to this file")
+    _add_stub_arguments(run_parser)
+
+    compare_parser = commands.add_parser("compare", help="compare results against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="allowed change in percent")
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        return compare(args)
+    try:
+        return asyncio.run(run(args) if args.command == "run" else serve_stubs(args))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Machine readable results and regression comparison.
+
+File format (BASELINE_FORMAT):
+{
+  "format": "loadtest-baseline/1",
+  "created_at": "...", "git_revision": "...", "host": {"cpus": 8, "python": "3.11.7"},
+  "scenarios": {
+    "<scenario>": {
+      "target_rps", "duration_s", "requests", "errors", "error_rate", "throughput_rps",
+      "latency_ms": {"p50", "p95", "p99", "max"}, "statuses": {...},
+      "resources": {"<pid>": {"cpu_percent", "rss_mb_max"}},
+      "upstream_requests": {"okta.jwks": n, "vault.login": n, ...}
+    }
+  }
+}
+"""
+import datetime
+import json
+import os
+import platform
+import subprocess
+from typing import List
+
+BASELINE_FORMAT = "loadtest-baseline/1"
+# Metrics compared between a baseline and a new run: name -> True when higher is worse
+COMPARED_METRICS = {
+    ("latency_ms", "p50"): True,
+    ("latency_ms", "p95"): True,
+    ("latency_ms", "p99"): True,
+    ("throughput_rps",): False,
+    ("error_rate",): True,
+}
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def new_results() -> dict:
+    return {
+        "format": BASELINE_FORMAT,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "host": {"cpus": os.cpu_count(), "python": platform.python_version(), "platform": platform.platform()},
+        "scenarios": {},
+    }
+
+
+def save(results: dict, path: str):
+    with open(path, "w") as results_file:
+        json.dump(results, results_file, indent=2, sort_keys=True)
+
+
+def load(path: str) -> dict:
+    with open(path) as results_file:
+        results = json.load(results_file)
+    if results.get("format") != BASELINE_FORMAT:
+        raise ValueError(f"{path} is not a {BASELINE_FORMAT} file")
+    return results
+
+
+def _metric(scenario: dict, path: tuple):
+    value = scenario
+    for key in path:
+        value = value[key]
+    return value
+
+
+def compare(baseline: dict, current: dict, threshold_percent: float) -> List[str]:
+    """Lines describing every compared metric; regressions are prefixed with REGRESSION"""
+    lines = []
+    for name, base in sorted(baseline["scenarios"].items()):
+        if name not in current["scenarios"]:
+            lines.append(f"MISSING    {name}: not in current results")
+            continue
+        now = current["scenarios"][name]
+        for path, higher_is_worse in COMPARED_METRICS.items():
+            before, after = _metric(base, path), _metric(now, path)
+            change = ((after - before) / before * 100) if before else (0.0 if after == before else float("inf"))
+            worse = change > threshold_percent if higher_is_worse else change < -threshold_percent
+            # Error rates near zero swing wildly in relative terms, only flag absolute increases over 1%
+            if path == ("error_rate",):
+                worse = after - before > 0.01
+            label = "REGRESSION" if worse else "ok        "
+            lines.append(f"{label} {name} {'.'.join(path)}: {before} -> {after} ({change:+.1f}%)")
+    return lines
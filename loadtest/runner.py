@@ -0,0 +1,164 @@
+"""
+Open-loop load generator and per-process resource sampling.
+
+Requests are started on a fixed schedule (request i at t0 + i / rps) whether or not earlier
+requests finished, and latency is measured from the scheduled start, so a slow server shows
+up as latency instead of silently lowering the offered load (no coordinated omission).
+"""
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+
+# A request function gets the shared session and the request index, returns the HTTP status
+RequestFunc = Callable[[aiohttp.ClientSession, int], Awaitable[int]]
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+@dataclass
+class LoadResult:
+    name: str
+    target_rps: float
+    duration_s: float
+    latencies_ms: List[float] = field(default_factory=list)
+    statuses: Dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+    wall_time_s: float = 0.0
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies_ms)
+        completed = len(latencies)
+        return {
+            "target_rps": self.target_rps,
+            "duration_s": self.duration_s,
+            "requests": completed,
+            "errors": self.errors,
+            "error_rate": round(self.errors / completed, 4) if completed else 0.0,
+            "throughput_rps": round(completed / self.wall_time_s, 2) if self.wall_time_s else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 0.50), 2),
+                "p95": round(percentile(latencies, 0.95), 2),
+                "p99": round(percentile(latencies, 0.99), 2),
+                "max": round(latencies[-1], 2) if latencies else 0.0,
+            },
+            "statuses": dict(sorted(self.statuses.items())),
+        }
+
+
+async def run_fixed_rps(name: str, request: RequestFunc, rps: float, duration_s: float,
+                        max_in_flight: int = 2000, timeout_s: float = 30.0) -> LoadResult:
+    """Drive `request` at `rps` for `duration_s` seconds and collect latencies/statuses"""
+    result = LoadResult(name=name, target_rps=rps, duration_s=duration_s)
+    total = int(rps * duration_s)
+    interval = 1.0 / rps
+    in_flight = asyncio.Semaphore(max_in_flight)
+    connector = aiohttp.TCPConnector(limit=max_in_flight)
+    timeout = aiohttp.ClientTimeout(total=timeout_s)
+
+    async def one(session, index, scheduled_at):
+        async with in_flight:
+            try:
+                status = await request(session, index)
+            except Exception as e:
+                status = type(e).__name__
+            result.latencies_ms.append((time.perf_counter() - scheduled_at) * 1000)
+            key = str(status)
+            result.statuses[key] = result.statuses.get(key, 0) + 1
+            if not isinstance(status, int) or status >= 400:
+                result.errors += 1
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        started = time.perf_counter()
+        tasks = []
+        for index in range(total):
+            scheduled_at = started + index * interval
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one(session, index, scheduled_at)))
+        await asyncio.gather(*tasks)
+        result.wall_time_s = time.perf_counter() - started
+    return result
+
+
+def _process_tree(root_pid: int) -> List[int]:
+    """The root pid and all of its descendants (uvicorn/gunicorn workers), from /proc"""
+    pids, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        try:
+            for task in os.listdir(f"/proc/{pid}/task"):
+                with open(f"/proc/{pid}/task/{task}/children") as children:
+                    stack.extend(int(child) for child in children.read().split())
+        except OSError:
+            continue
+    return pids
+
+
+def _cpu_seconds_and_rss(pid: int) -> Optional[tuple]:
+    try:
+        with open(f"/proc/{pid}/stat") as stat_file:
+            fields = stat_file.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{pid}/statm") as statm_file:
+            rss_pages = int(statm_file.read().split()[1])
+    except OSError:
+        return None
+    # Fields after the command name: utime and stime are the 12th and 13th
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    return cpu_seconds, rss_pages * PAGE_SIZE
+
+
+class ResourceSampler:
+    """Samples CPU% and RSS of a server process tree (Linux /proc) while a scenario runs"""
+
+    def __init__(self, root_pid: int, interval_s: float = 0.5):
+        self.root_pid = root_pid
+        self.interval_s = interval_s
+        self._samples: Dict[int, List[tuple]] = {}
+        self._task = None
+
+    def _sample(self):
+        now = time.perf_counter()
+        for pid in _process_tree(self.root_pid):
+            reading = _cpu_seconds_and_rss(pid)
+            if reading:
+                self._samples.setdefault(pid, []).append((now, *reading))
+
+    async def _run(self):
+        while True:
+            self._sample()
+            await asyncio.sleep(self.interval_s)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> dict:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._sample()
+        workers = {}
+        for pid, samples in self._samples.items():
+            (t0, cpu0, _), (t1, cpu1, _) = samples[0], samples[-1]
+            elapsed = t1 - t0
+            workers[str(pid)] = {
+                "cpu_percent": round((cpu1 - cpu0) / elapsed * 100, 1) if elapsed > 0 else 0.0,
+                "rss_mb_max": round(max(rss for _, _, rss in samples) / 2 ** 20, 1),
+            }
+        return workers
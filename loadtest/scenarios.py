@@ -0,0 +1,162 @@
+"""
+Scenarios. Each one gets a ScenarioContext (target URLs, stub servers) and returns the
+request function driven by the runner, after doing any setup it needs.
+"""
+import itertools
+import json
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+
+import aiohttp
+
+from loadtest.runner import RequestFunc
+from loadtest.stubs import StubServers
+
+DSAAS_PREFIX = "/services/dataplatform/dsaas"
+
+CREATE_PROJECT_BODY = json.dumps({
+    "project_details": {
+        "apms_id": "12345", "ci_id": "CI0098765", "business_unit": "R&D", "data_classification": "Confidential",
+        "environment": "dev", "data_sharing_type": "cross_account", "transfer_type": "push",
+    },
+    "cross_account": {
+        "source_details": {"bucket": "src-bucket", "path": "landing/in/", "file_format": "parquet",
+                           "kms_arn": "arn:aws:kms:us-east-1:111111111111:key/abcd", "region": "us-east-1",
+                           "vendor_name": "acme"},
+        "target_details": {"bucket": "tgt-bucket", "path": "raw/acme/",
+                           "kms_arn": "arn:aws:kms:us-east-1:222222222222:key/efgh", "region": "us-east-1"},
+        "pipeline": {"frequency": "daily", "schedule_type": "cron", "cron_expression": "0 2 * * *"},
+        "acknowledgement": True,
+    },
+}).encode("utf-8")
+
+# Distinct users, so per-user state (rate limits, caches) is exercised like real traffic
+DSAAS_USERS = 50
+# Jobs created before the polling scenarios start
+JOBS_PRELOAD = 200
+
+
+@dataclass
+class ScenarioContext:
+    stubs: StubServers
+    dsaas_url: Optional[str] = None
+    jobs_url: Optional[str] = None
+
+
+async def dsaas_health(ctx: ScenarioContext, session: aiohttp.ClientSession) -> RequestFunc:
+    url = f"{ctx.dsaas_url}{DSAAS_PREFIX}/health"
+
+    async def request(session, index):
+        async with session.get(url) as response:
+            await response.read()
+            return response.status
+
+    return request
+
+
+async def dsaas_create_project(ctx: ScenarioContext, session: aiohttp.ClientSession) -> RequestFunc:
+    url = f"{ctx.dsaas_url}{DSAAS_PREFIX}/create_project"
+    headers = [
+        {"Authorization": f"Bearer {ctx.stubs.minter.mint(f'user{n}@example.com')}", "Content-Type": "application/json"}
+        for n in range(DSAAS_USERS)
+    ]
+
+    async def request(session, index):
+        async with session.post(url, data=CREATE_PROJECT_BODY, headers=headers[index % DSAAS_USERS]) as response:
+            await response.read()
+            return response.status
+
+    return request
+
+
+# Projects created before the execution status scenario starts
+EXECUTIONS_PRELOAD = 50
+
+
+async def dsaas_execution_status(ctx: ScenarioContext, session: aiohttp.ClientSession) -> RequestFunc:
+    """Many users watching their projects; upstream harness.status calls should stay bounded"""
+    create_url = f"{ctx.dsaas_url}{DSAAS_PREFIX}/create_project"
+    headers = [{"Authorization": f"Bearer {ctx.stubs.minter.mint(f'user{n}@example.com')}"} for n in range(DSAAS_USERS)]
+    execution_ids = []
+    for index in range(EXECUTIONS_PRELOAD):
+        async with session.post(create_url, data=CREATE_PROJECT_BODY,
+                                headers={**headers[index % DSAAS_USERS], "Content-Type": "application/json"}) as response:
+            execution_ids.append((await response.json())["data"]["data"]["planExecution"]["uuid"])
+    urls = [f"{ctx.dsaas_url}{DSAAS_PREFIX}/executions/{execution_id}" for execution_id in execution_ids]
+
+    async def request(session, index):
+        async with session.get(urls[index % len(urls)], headers=headers[index % DSAAS_USERS]) as response:
+            await response.read()
+            return response.status
+
+    return request
+
+
+async def jobs_trigger(ctx: ScenarioContext, session: aiohttp.ClientSession) -> RequestFunc:
+    url = f"{ctx.jobs_url}/api/v1/jobs/trigger"
+    source_types = ("api", "database", "file")
+
+    async def request(session, index):
+        body = {"source_type": source_types[index % 3], "config": {"loadtest": True, "n": index}}
+        async with session.post(url, json=body) as response:
+            await response.read()
+            return response.status
+
+    return request
+
+
+async def _preload_jobs(ctx: ScenarioContext, session: aiohttp.ClientSession):
+    job_ids = []
+    for index in range(JOBS_PRELOAD):
+        async with session.post(f"{ctx.jobs_url}/api/v1/jobs/trigger",
+                                json={"source_type": "api", "config": {"n": index}}) as response:
+            job_ids.append((await response.json())["job_id"])
+    return job_ids
+
+
+async def jobs_status(ctx: ScenarioContext, session: aiohttp.ClientSession) -> RequestFunc:
+    job_ids = itertools.cycle(await _preload_jobs(ctx, session))
+
+    async def request(session, index):
+        async with session.get(f"{ctx.jobs_url}/api/v1/jobs/status/{next(job_ids)}") as response:
+            await response.read()
+            return response.status
+
+    return request
+
+
+async def jobs_result(ctx: ScenarioContext, session: aiohttp.ClientSession) -> RequestFunc:
+    job_ids = itertools.cycle(await _preload_jobs(ctx, session))
+
+    async def request(session, index):
+        async with session.get(f"{ctx.jobs_url}/api/v1/jobs/result/{next(job_ids)}") as response:
+            await response.read()
+            # 400 while a job is still running is an expected answer, not an error
+            return 200 if response.status == 400 else response.status
+
+    return request
+
+
+async def jobs_list(ctx: ScenarioContext, session: aiohttp.ClientSession) -> RequestFunc:
+    await _preload_jobs(ctx, session)
+
+    async def request(session, index):
+        async with session.get(f"{ctx.jobs_url}/api/v1/jobs") as response:
+            await response.read()
+            return response.status
+
+    return request
+
+
+# name -> (service, setup coroutine)
+SCENARIOS: Dict[str, tuple] = {
+    "dsaas_health": ("dsaas", dsaas_health),
+    "dsaas_create_project": ("dsaas", dsaas_create_project),
+    "dsaas_execution_status": ("dsaas", dsaas_execution_status),
+    "jobs_trigger": ("jobs", jobs_trigger),
+    "jobs_status": ("jobs", jobs_status),
+    "jobs_result": ("jobs", jobs_result),
+    "jobs_list": ("jobs", jobs_list),
+}
+
+ScenarioSetup = Callable[[ScenarioContext, aiohttp.ClientSession], Awaitable[RequestFunc]]
@@ -0,0 +1,237 @@
+"""
+Local stand-ins for the upstreams of the DSaaS backend:
+
+  Okta     GET  /oauth2/default/v1/keys      JWKS with a test RSA key
+           POST /oauth2/default/v1/token     mints an RS256 access token (?sub=...&ttl=...&groups=a,b)
+  Vault    POST /v1/auth/approle/login       AppRole login
+           GET  /v1/{mount}/data/{path}      KV v2 read
+  Harness  POST /gateway/pipeline/api/pipeline/execute/{pipeline_id}
+           GET  /gateway/pipeline/api/pipelines/execution/v2/{execution_id}   Running, then Success
+
+Every stub takes a fixed latency plus optional jitter and an error rate, so scenarios
+can model slow or flaky upstreams. Each stub counts the requests it served, which is
+how the suite checks upstream fan-out (for example JWKS fetches per request).
+"""
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict
+
+import jwt
+from aiohttp import web
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+OKTA_ISSUER_PATH = "/oauth2/default"
+TEST_KEY_ID = "loadtest-key"
+TEST_AUDIENCE = "api://oneData"
+VAULT_TOKEN = "s.loadtest-token"
+HARNESS_API_KEY = "pat.loadtest"
+# Simulated run time of a Harness pipeline execution
+HARNESS_EXECUTION_SECONDS = 10.0
+
+
+@dataclass
+class StubBehaviour:
+    """Latency and failure injection of one stub"""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+
+    async def apply(self):
+        """Sleep for the configured latency, return an error response for injected failures"""
+        delay = self.latency_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate and random.random() < self.error_rate:
+            return web.json_response({"status": "ERROR", "message": "injected failure"}, status=self.error_status)
+        return None
+
+
+@dataclass
+class StubCounters:
+    requests: Dict[str, int] = field(default_factory=dict)
+
+    def hit(self, name: str):
+        self.requests[name] = self.requests.get(name, 0) + 1
+
+
+class TokenMinter:
+    """Test RSA key pair, its JWKS document and RS256 tokens signed with it"""
+
+    def __init__(self, issuer: str, audience: str = TEST_AUDIENCE):
+        self.issuer = issuer
+        self.audience = audience
+        self._private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        public_jwk = json.loads(RSAAlgorithm.to_jwk(self._private_key.public_key()))
+        public_jwk.update({"kid": TEST_KEY_ID, "alg": "RS256", "use": "sig"})
+        self.jwks = {"keys": [public_jwk]}
+
+    def mint(self, sub: str = "loadtest@example.com", ttl_seconds: int = 3600, groups=None) -> str:
+        now = int(time.time())
+        claims = {"sub": sub, "iss": self.issuer, "aud": self.audience, "iat": now, "exp": now + ttl_seconds}
+        if groups:
+            claims["groups"] = list(groups)
+        return jwt.encode(claims, self._private_key, algorithm="RS256", headers={"kid": TEST_KEY_ID})
+
+
+def okta_app(minter: TokenMinter, behaviour: StubBehaviour, counters: StubCounters) -> web.Application:
+    async def keys(request):
+        counters.hit("okta.jwks")
+        failure = await behaviour.apply()
+        if failure:
+            return failure
+        return web.json_response(minter.jwks)
+
+    async def token(request):
+        counters.hit("okta.token")
+        sub = request.query.get("sub", "loadtest@example.com")
+        ttl = int(request.query.get("ttl", "3600"))
+        groups = [group for group in request.query.get("groups", "").split(",") if group]
+        return web.json_response({"access_token": minter.mint(sub, ttl, groups), "token_type": "Bearer", "expires_in": ttl})
+
+    app = web.Application()
+    app.router.add_get(f"{OKTA_ISSUER_PATH}/v1/keys", keys)
+    app.router.add_post(f"{OKTA_ISSUER_PATH}/v1/token", token)
+    return app
+
+
+def vault_app(behaviour: StubBehaviour, counters: StubCounters) -> web.Application:
+    async def login(request):
+        counters.hit("vault.login")
+        failure = await behaviour.apply()
+        if failure:
+            return failure
+        return web.json_response({"auth": {"client_token": VAULT_TOKEN, "lease_duration": 3600, "renewable": True}})
+
+    async def read(request):
+        counters.hit("vault.read")
+        failure = await behaviour.apply()
+        if failure:
+            return failure
+        if request.headers.get("X-Vault-Token") != VAULT_TOKEN:
+            return web.json_response({"errors": ["permission denied"]}, status=403)
+        return web.json_response({"data": {"data": {"x-api-key": HARNESS_API_KEY}, "metadata": {"version": 1}}})
+
+    app = web.Application()
+    app.router.add_post("/v1/auth/approle/login", login)
+    app.router.add_get("/v1/{mount}/data/{path:.+}", read)
+    return app
+
+
+def harness_app(behaviour: StubBehaviour, counters: StubCounters) -> web.Application:
+    started = {}
+
+    async def execute(request):
+        counters.hit("harness.execute")
+        failure = await behaviour.apply()
+        if failure:
+            return failure
+        if request.headers.get("x-api-key") != HARNESS_API_KEY:
+            return web.json_response({"status": "ERROR", "message": "Invalid API key"}, status=401)
+        await request.read()
+        execution_id = uuid.uuid4().hex
+        started[execution_id] = time.monotonic()
+        return web.json_response({
+            "status": "SUCCESS",
+            "data": {"planExecution": {"uuid": execution_id, "status": "RUNNING",
+                                       "startTs": int(time.time() * 1000),
+                                       "planExecutionId": request.match_info["pipeline_id"]}},
+            "correlationId": str(uuid.uuid4()),
+        })
+
+    async def status(request):
+        counters.hit("harness.status")
+        failure = await behaviour.apply()
+        if failure:
+            return failure
+        if request.headers.get("x-api-key") != HARNESS_API_KEY:
+            return web.json_response({"status": "ERROR", "message": "Invalid API key"}, status=401)
+        execution_id = request.match_info["execution_id"]
+        if execution_id not in started:
+            return web.json_response({"status": "ERROR", "message": "Execution not found"}, status=404)
+        done = time.monotonic() - started[execution_id] >= HARNESS_EXECUTION_SECONDS
+        return web.json_response({
+            "status": "SUCCESS",
+            "data": {"pipelineExecutionSummary": {"planExecutionId": execution_id,
+                                                  "status": "Success" if done else "Running"}},
+        })
+
+    app = web.Application()
+    app.router.add_post("/gateway/pipeline/api/pipeline/execute/{pipeline_id}", execute)
+    app.router.add_get("/gateway/pipeline/api/pipelines/execution/v2/{execution_id}", status)
+    return app
+
+
+@dataclass
+class StubServers:
+    """Okta, Vault and Harness stubs on localhost ports, started and stopped together"""
+    host: str = "127.0.0.1"
+    okta_port: int = 18200
+    vault_port: int = 18201
+    harness_port: int = 18202
+    okta: StubBehaviour = field(default_factory=StubBehaviour)
+    vault: StubBehaviour = field(default_factory=StubBehaviour)
+    harness: StubBehaviour = field(default_factory=StubBehaviour)
+    counters: StubCounters = field(default_factory=StubCounters)
+
+    def __post_init__(self):
+        self.minter = TokenMinter(self.okta_issuer)
+        self._runners = []
+
+    @property
+    def okta_issuer(self) -> str:
+        return f"http://{self.host}:{self.okta_port}{OKTA_ISSUER_PATH}"
+
+    @property
+    def vault_url(self) -> str:
+        return f"http://{self.host}:{self.vault_port}/"
+
+    @property
+    def harness_base_url(self) -> str:
+        return (f"http://{self.host}:{self.harness_port}/gateway/pipeline/api/pipeline/execute/PIPELINE_ID"
+                "?accountIdentifier=loadtest&orgIdentifier=loadtest&projectIdentifier=loadtest")
+
+    @property
+    def harness_status_url(self) -> str:
+        return (f"http://{self.host}:{self.harness_port}/gateway/pipeline/api/pipelines/execution/v2/EXECUTION_ID"
+                "?accountIdentifier=loadtest&orgIdentifier=loadtest&projectIdentifier=loadtest")
+
+    def dsaas_config(self) -> dict:
+        """Backend config file (DSAAS_CONFIG_PATH) pointing every upstream at these stubs"""
+        return {
+            "environment": "dev",
+            "URL_KEY": self.vault_url,
+            "NAMESPACE_KEY": "admin/loadtest",
+            "ROLE_ID_KEY": "loadtest-role",
+            "SECRET_ID_KEY": "loadtest-secret",
+            "VAULT_SECRET_ENGINE": {"dev": "kv-dev", "tst": "kv-tst", "prd": "kv-prd"},
+            "cross_account_pipeline_id": "LoadTestCrossAccountPipeline",
+            "OKTA_ISSUER": self.okta_issuer,
+            "OKTA_AUDIENCE": TEST_AUDIENCE,
+            "HARNESS_BASE_URL": self.harness_base_url,
+            "HARNESS_STATUS_URL": self.harness_status_url,
+            # Limits stay enabled so their cost is measured, but high enough that no scenario is throttled
+            "rate_limits": {"default": {"requests_per_minute": 6000000, "burst": 100000}, "routes": {}},
+        }
+
+    async def start(self):
+        apps = (
+            (okta_app(self.minter, self.okta, self.counters), self.okta_port),
+            (vault_app(self.vault, self.counters), self.vault_port),
+            (harness_app(self.harness, self.counters), self.harness_port),
+        )
+        for app, port in apps:
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            await web.TCPSite(runner, self.host, port).start()
+            self._runners.append(runner)
+
+    async def stop(self):
+        for runner in self._runners:
+            await runner.cleanup()
+        self._runners.clear()